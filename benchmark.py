@@ -0,0 +1,137 @@
+"""
+Benchmarks for reading TriggerData.txt.
+
+Usage: python benchmark.py [path] [repetitions]
+"""
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import timeit
+
+from my_collections import BlockParser
+from main import read_file, read_path, read_mapped_file, load_data, load_cached_file
+from editorobjects import Workspace, TriggerEditorObjectParser, parse_blocks, load_parsed_sections
+from editorfiles.lexer import minimize_line
+from editorfiles.mapped import MappedTriggerData
+
+
+def _legacy_minimize_line(string):
+    # type: (str) -> str
+    """The regex based implementation of minimize_line that was used before the lexer."""
+    string_uncommented = string[:string.find('//')]
+    return re.sub(r'\s+(?=(?:[^\'"]*[\'"][^\'"]*[\'"])*[^\'"]*$)', '', string_uncommented, flags=re.UNICODE)
+
+
+def _legacy_read_file(file_handle):
+    contents = BlockParser()
+    for line in file_handle:
+        line = _legacy_minimize_line(line)
+        if line != '':
+            if line[0] == '[':
+                contents.new_category(line[1:-1])
+            elif line[0] == '_':
+                contents.add_line(line)
+            else:
+                contents.new_block()
+                contents.add_line(line)
+    return contents
+
+
+def _read_decoded_file(path):
+    with io.open(path, 'r', encoding="utf-8-sig") as f:
+        return read_file(f)
+
+
+def _read_mapped_sections(path, sections=None):
+    with read_mapped_file(path) as blocks:
+        for section in (sections or list(blocks)):
+            blocks[section]
+
+
+def _index_mapped_file(path):
+    with MappedTriggerData(path):
+        pass
+
+
+def _parse_sections(path):
+    with read_mapped_file(path) as blocks:
+        for section in blocks:
+            if TriggerEditorObjectParser.supports(section):
+                parse_blocks(section, blocks[section])
+
+
+def _load_file(path, trusted=False):
+    with Workspace():
+        with read_mapped_file(path) as blocks:
+            load_data(blocks, trusted=trusted)
+
+
+def _load_cached_file(path):
+    with Workspace():
+        load_cached_file(path)
+
+
+def _read_lines(path):
+    with io.open(path, 'r', encoding="utf-8-sig") as f:
+        return f.readlines()
+
+
+_SMALL_SECTIONS = ['TriggerCategories', 'TriggerTypes']
+
+
+def bench(name, function, repetitions):
+    best = min(timeit.repeat(function, number=1, repeat=repetitions))
+    print '{:<40}{:>10.2f} ms'.format(name, best * 1000)
+    return best
+
+
+def main(path='TriggerData.txt', repetitions=10):
+    lines = _read_lines(path)
+    print 'File: {} ({} lines), best of {}'.format(path, len(lines), repetitions)
+
+    legacy = bench('regex minimize_line', lambda: [_legacy_minimize_line(x) for x in lines], repetitions)
+    lexer = bench('lexer minimize_line', lambda: [minimize_line(x) for x in lines], repetitions)
+    print 'Speedup: {:.1f}x'.format(legacy / lexer)
+
+    legacy = bench('regex minimize_line + read_file', lambda: _legacy_read_file(lines), repetitions)
+    lexer = bench('lexer read_file', lambda: read_file(lines), repetitions)
+    print 'Speedup: {:.1f}x'.format(legacy / lexer)
+
+    bench('io.open + read_file', lambda: _read_decoded_file(path), repetitions)
+    bench('read_path (bulk decode)', lambda: read_path(path), repetitions)
+    bench('read_mapped_file, all sections', lambda: _read_mapped_sections(path), repetitions)
+    bench('read_mapped_file, categories and types', lambda: _read_mapped_sections(path, _SMALL_SECTIONS), repetitions)
+    bench('MappedTriggerData index only', lambda: _index_mapped_file(path), repetitions)
+
+    # The cache file is written next to a copy of the file, so no cache file is left next to the original.
+    folder = tempfile.mkdtemp()
+    try:
+        copy = os.path.join(folder, os.path.basename(path))
+        shutil.copyfile(path, copy)
+        load_parsed_sections(copy)  # Writes the cache file.
+
+        parse = bench('parse all sections', lambda: _parse_sections(copy), repetitions)
+        cache = bench('parse cache hit', lambda: load_parsed_sections(copy), repetitions)
+        print 'Speedup: {:.1f}x'.format(parse / cache)
+        parse = bench('load_data', lambda: _load_file(copy), repetitions)
+        trusted = bench('load_data (trusted)', lambda: _load_file(copy, True), repetitions)
+        print 'Speedup: {:.1f}x'.format(parse / trusted)
+        # The copy has the same contents as the base file, so it is loaded in trusted mode if the base file is trusted.
+        cache = bench('load_cached_file (cache hit)', lambda: _load_cached_file(copy), repetitions)
+        print 'Speedup: {:.1f}x'.format(parse / cache)
+    finally:
+        shutil.rmtree(folder)
+
+    # Long quoted _Defaults lines are where the lookahead regex degrades to quadratic time.
+    long_lines = ['_Function_Defaults=' + ','.join(['"a b"'] * 200) + '\n'] * 200
+    print 'Long quoted lines: {} lines of {} characters'.format(len(long_lines), len(long_lines[0]))
+    legacy = bench('regex minimize_line', lambda: [_legacy_minimize_line(x) for x in long_lines], repetitions)
+    lexer = bench('lexer minimize_line', lambda: [minimize_line(x) for x in long_lines], repetitions)
+    print 'Speedup: {:.1f}x'.format(legacy / lexer)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else 'TriggerData.txt', int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,17 @@
+# noinspection PyUnresolvedReferences
+from lexer import minimize_line, tokenize, parse_line, Token, LineRecord, TOKEN_SECTION, TOKEN_DECLARATION, \
+    TOKEN_BLOCK_MEMBER
+# noinspection PyUnresolvedReferences
+from mapped import MappedTriggerData, MappedFile
+# noinspection PyUnresolvedReferences
+from cst import TriggerDataDocument
+# noinspection PyUnresolvedReferences
+from encoding import decode_bytes, detect_encoding, resolve_encoding, read_text, FALLBACK_ENCODINGS
+# noinspection PyUnresolvedReferences
+from strings import StringTable, StringFile
+# noinspection PyUnresolvedReferences
+from cache import load_cache, store_cache
+# noinspection PyUnresolvedReferences
+from jass import JassIndex, JassFunction, scan_jass, JASS_CACHE_EXTENSION
+# noinspection PyUnresolvedReferences
+from wtg import WtgReader, WtgCategory, WtgVariable, WtgTrigger, WtgFunction, WtgParameter, UndefinedFunctionError
@@ -0,0 +1,39 @@
+"""
+This module contains the helpers shared by the cache files that are stored next to the files they were computed from,
+such as the .jcache files of JASS files (see editorfiles.jass) and the .tdcache files of TriggerData files (see
+editorobjects.load_parsed_sections).
+
+A cache file contains a pickled (version, digest, payload) tuple. The version identifies the code that computed the
+payload and the digest identifies the contents of the source file.
+"""
+import cPickle
+
+
+def load_cache(path, version, digest):
+    """
+    Returns the payload stored in a cache file, or None if there is no cache file, if it is unreadable, or if its
+    version or digest do not match.
+
+    :param path: The path of the cache file.
+    """
+    try:
+        with open(path, 'rb') as f:
+            cached_version, cached_digest, payload = cPickle.load(f)
+    except (IOError, EOFError, ValueError, TypeError, AttributeError, ImportError, cPickle.UnpicklingError):
+        return None
+    if cached_version != version or cached_digest != digest:
+        return None
+    return payload
+
+
+def store_cache(path, version, digest, payload):
+    """
+    Writes a cache file that load_cache can read. Failing to write it (for example, in a read-only folder) is ignored.
+
+    :param path: The path of the cache file.
+    """
+    try:
+        with open(path, 'wb') as f:
+            cPickle.dump((version, digest, payload), f, cPickle.HIGHEST_PROTOCOL)
+    except IOError:
+        pass
@@ -0,0 +1,195 @@
+"""
+This module contains a lossless representation of files in the TriggerData.txt format.
+
+A TriggerDataDocument keeps the original text of a file, along with the span (start and end offsets) of every section
+and block in it. Changes are recorded per block, and saving the document copies the original text verbatim, except for
+the spans of the blocks that were changed. Comments, blank lines and formatting outside of those spans are preserved,
+so a document that is saved without changes is byte-identical to the original file.
+"""
+from collections import OrderedDict
+import io
+
+from my_exceptions import TriggerSyntaxException
+from lexer import minimize_line, INDICATOR_CATEGORY, INDICATOR_BLOCK_MEMBER
+from encoding import decode_bytes, BOMS
+
+
+class BlockNode(object):
+    """
+    The span of a block in the original text. The span starts at the beginning of the declaration line and ends at the
+    end of the last block member line, excluding the line break. Comments between those lines are part of the span.
+    """
+    __slots__ = ('key', 'start', 'end', 'line_end')
+
+    def __init__(self, key, start, end, line_end):
+        self.key = key
+        self.start = start
+        self.end = end
+        self.line_end = line_end  # The end of the span including the line break.
+
+
+class SectionNode(object):
+    """The span of a section header in the original text and the BlockNodes of the section, by key."""
+    __slots__ = ('name', 'start', 'end', 'blocks')
+
+    def __init__(self, name, start, end):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.blocks = OrderedDict()  # type: OrderedDict[str, BlockNode]
+
+
+class TriggerDataDocument(object):
+    """
+    A lossless view of a file in the TriggerData.txt format. Use from_file to read a file and save to write it back.
+    """
+
+    def __init__(self, text, encoding='utf-8', bom=False):
+        self.encoding = encoding
+        self.bom = bom
+        self._text = text
+        self.newline = u'\r\n' if u'\r\n' in text else u'\n'
+        self.sections = OrderedDict()  # type: OrderedDict[str, SectionNode]
+
+        self._replacements = {}  # type: dict[tuple[str, str], unicode | None]
+        self._insertions = OrderedDict()  # type: OrderedDict[str, list[unicode]]
+
+        self._parse()
+
+    @classmethod
+    def from_file(cls, path, encoding=None):
+        """Reads a document from a file. If encoding is None, it is detected (see editorfiles.encoding)."""
+        with open(path, 'rb') as f:
+            text, encoding, bom = decode_bytes(f.read(), encoding)
+        return cls(text, encoding, bom)
+
+    def _parse(self):
+        section = None
+        block = None
+        offset = 0
+        for line in self._text.split(u'\n'):
+            line_start = offset
+            offset += len(line) + 1
+            line_end = line_start + len(line.rstrip(u'\r'))
+
+            text = minimize_line(line)
+            if not text:
+                continue
+            if text[0] == INDICATOR_CATEGORY:
+                name = text[1:-1]
+                if name in self.sections:
+                    raise TriggerSyntaxException('Category ' + name + ' already exists!')
+                section = self.sections[name] = SectionNode(name, line_start, line_end)
+                block = None
+            elif text[0] == INDICATOR_BLOCK_MEMBER:
+                if block is None:
+                    raise TriggerSyntaxException('Block member found outside block!')
+                block.end = line_end
+                block.line_end = min(offset, len(self._text))
+            elif section is not None:
+                block = BlockNode(text.partition('=')[0], line_start, line_end, min(offset, len(self._text)))
+                section.blocks[block.key] = block
+
+    def span(self, section, key):
+        # type: (str, str) -> tuple[int, int]
+        """Returns the span of a block in the original text."""
+        block = self.sections[section].blocks[key]
+        return block.start, block.end
+
+    def original_text(self, section, key):
+        # type: (str, str) -> unicode
+        start, end = self.span(section, key)
+        return self._text[start:end]
+
+    def replace_block(self, section, key, text):
+        """Replaces the text of an existing block. The text must not end with a line break."""
+        if key not in self.sections[section].blocks:
+            raise TriggerSyntaxException('Symbol ' + key + ' is not defined.')
+        self._replacements[(section, key)] = text
+
+    def remove_block(self, section, key):
+        """Removes an existing block, along with its line break."""
+        if key not in self.sections[section].blocks:
+            raise TriggerSyntaxException('Symbol ' + key + ' is not defined.')
+        self._replacements[(section, key)] = None
+
+    def insert_block(self, section, text):
+        """Adds a new block after the last block of a section."""
+        if section not in self.sections:
+            raise TriggerSyntaxException("This trigger editor class is not recognized.")
+        self._insertions.setdefault(section, []).append(text)
+
+    def update_object(self, section, obj):
+        """
+        Writes the block of a TriggerEditorObject, as returned by its convert_to_block method. If the document has no
+        block with the object's key in that section, the block is inserted at the end of the section.
+
+        Blocks that are equivalent to their original text are left untouched, so their comments and formatting are
+        kept. Blocks are equivalent if they have the same lines once comments and whitespace are removed, with the block
+        members in any order (see _normalize_block).
+        """
+        text = obj.convert_to_block().rstrip(u'\n').replace(u'\n', self.newline)
+        key = text.partition('=')[0]
+        if key in self.sections[section].blocks:
+            if _normalize_block(text) == _normalize_block(self.original_text(section, key)):
+                self._replacements.pop((section, key), None)
+            else:
+                self.replace_block(section, key, text)
+        else:
+            self.insert_block(section, text)
+
+    @property
+    def modified(self):
+        # type: () -> bool
+        return bool(self._replacements or self._insertions)
+
+    def _edits(self):
+        """Returns the changes as a list of (start, end, text) tuples, sorted by start."""
+        edits = []
+        for (section, key), text in self._replacements.iteritems():
+            block = self.sections[section].blocks[key]
+            if text is None:
+                edits.append((block.start, block.line_end, u''))
+            else:
+                edits.append((block.start, block.end, text))
+
+        for section, texts in self._insertions.iteritems():
+            node = self.sections[section]
+            position = next(reversed(node.blocks.values())).end if node.blocks else node.end
+            edits.append((position, position, u''.join(self.newline + text for text in texts)))
+
+        edits.sort(key=lambda edit: edit[0])
+        return edits
+
+    def iter_text(self):
+        """Yields the text of the document in pieces: unchanged spans of the original text and changed blocks."""
+        position = 0
+        for start, end, text in self._edits():
+            if start > position:
+                yield self._text[position:start]
+            yield text
+            position = max(position, end)
+        if position < len(self._text):
+            yield self._text[position:]
+
+    def to_text(self):
+        # type: () -> unicode
+        return u''.join(self.iter_text())
+
+    def save(self, path):
+        """Writes the document to a file, using its original encoding, byte order mark and line breaks."""
+        with io.open(path, 'wb') as f:
+            if self.bom:
+                f.write(BOMS[self.encoding])
+            for piece in self.iter_text():
+                f.write(piece.encode(self.encoding))
+
+
+def _normalize_block(text):
+    # type: (unicode) -> tuple[unicode, list[unicode]]
+    """
+    Returns the minimized declaration line of a block and its sorted minimized block member lines. Comments and blank
+    lines are dropped, and the order of the block members does not matter.
+    """
+    lines = [line for line in (minimize_line(line) for line in text.split(u'\n')) if line]
+    return lines[0], sorted(lines[1:])
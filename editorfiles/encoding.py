@@ -0,0 +1,124 @@
+"""
+This module contains the detection of the text encoding of files in the TriggerData.txt format.
+
+Files written by the World Editor are encoded in UTF-8, but many files written by other tools (or by hand) are encoded
+in the ANSI code page of Windows (cp1252) or have no byte order mark. Instead of decoding a file line by line with a
+fixed encoding, its encoding is detected from its bytes and used to decode it:
+
+1. The encoding given by the byte order mark, if there is one.
+2. UTF-8.
+3. cp1252.
+4. latin-1, which can decode any byte. cp1252 leaves five bytes undefined.
+
+Only a bounded sample of a file is decoded to detect its encoding: DETECTION_SAMPLE_SIZE bytes from its first
+non-ASCII byte (files that are plain ASCII are UTF-8). This keeps opening a memory-mapped file cheap. A byte after the
+sample that cannot be decoded raises an error when the part of the file that holds it is decoded.
+"""
+import codecs
+import re
+
+
+FALLBACK_ENCODINGS = ('utf-8', 'cp1252', 'latin-1')
+
+DETECTION_SAMPLE_SIZE = 1 << 16  # The number of bytes decoded to detect an encoding.
+
+# Maps the encodings that can be detected from a byte order mark to their byte order mark.
+BOMS = {
+    'utf-8': codecs.BOM_UTF8,
+    'utf-16-le': codecs.BOM_UTF16_LE,
+    'utf-16-be': codecs.BOM_UTF16_BE,
+}
+
+_NON_ASCII = re.compile(r'[\x80-\xff]')
+
+
+def detect_bom(data):
+    # type: (str) -> str
+    """
+    Returns the encoding given by the byte order mark at the start of data, or None if there is no byte order mark.
+    """
+    for encoding, bom in BOMS.iteritems():
+        if data[:len(bom)] == bom:
+            return encoding
+    return None
+
+
+def detect_encoding(data):
+    # type: (str) -> str
+    """
+    Returns the encoding of data: the encoding of its byte order mark, or else the first of FALLBACK_ENCODINGS that
+    can decode the sample that starts at its first non-ASCII byte. data may be a memory map, which is not copied.
+    """
+    bom_encoding = detect_bom(data)
+    if bom_encoding is not None:
+        return bom_encoding
+    match = _NON_ASCII.search(data)
+    if match is None:
+        return FALLBACK_ENCODINGS[0]
+
+    end = match.start() + DETECTION_SAMPLE_SIZE
+    sample = data[match.start():end]
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            sample.decode(encoding)
+        except UnicodeDecodeError as error:
+            # A sample that is cut off before the end of the data may end in the middle of a character.
+            if end >= len(data) or error.end != len(sample) or error.reason != 'unexpected end of data':
+                continue
+        return encoding
+
+
+def resolve_encoding(data, encoding=None):
+    # type: (str, str) -> tuple[str, bool]
+    """
+    Returns the encoding to decode data with and whether data starts with the byte order mark of that encoding, which
+    must be skipped before decoding. 'utf-8-sig' is resolved to 'utf-8', so that the byte order mark is reported
+    instead of being dropped silently by the codec.
+
+    :param encoding: The encoding of the data. If None, it is detected (see detect_encoding).
+    :return: An (encoding, bom) tuple.
+    """
+    if encoding is None:
+        encoding = detect_encoding(data)
+    elif codecs.lookup(encoding).name == 'utf-8-sig':
+        encoding = 'utf-8'
+    bom_encoding = detect_bom(data)
+    if bom_encoding is not None and codecs.lookup(encoding).name == codecs.lookup(bom_encoding).name:
+        return bom_encoding, True
+    return encoding, False
+
+
+def decode_bytes(data, encoding=None):
+    # type: (str, str) -> tuple[unicode, str, bool]
+    """
+    Decodes the contents of a file. The byte order mark is not included in the decoded text.
+
+    :param data: The raw contents of the file.
+    :param encoding: The encoding of the file. If None, the encoding is detected. A byte order mark is removed
+    if it matches the encoding.
+    :return: A (text, encoding, bom) tuple, where bom is True if the data started with a byte order mark.
+    """
+    detected = encoding is None
+    encoding, bom = resolve_encoding(data, encoding)
+    if bom:
+        return data[len(BOMS[encoding]):].decode(encoding), encoding, True
+    if not detected:
+        return data.decode(encoding), encoding, False
+
+    # The encoding was detected from a sample, so a byte after the sample may still require a later fallback.
+    for encoding in FALLBACK_ENCODINGS[FALLBACK_ENCODINGS.index(encoding):]:
+        try:
+            return data.decode(encoding), encoding, False
+        except UnicodeDecodeError:
+            continue
+
+
+def read_text(path, encoding=None):
+    # type: (str, str) -> tuple[unicode, str, bool]
+    """
+    Reads a whole file and decodes it in bulk (see decode_bytes).
+
+    :return: A (text, encoding, bom) tuple.
+    """
+    with open(path, 'rb') as f:
+        return decode_bytes(f.read(), encoding)
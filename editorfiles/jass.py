@@ -0,0 +1,115 @@
+"""
+This module contains a scanner for the declarations of JASS script files, such as common.j and Blizzard.j.
+
+Only the declarations that are needed to check TriggerData files are read: natives and functions (with their parameter
+types and return type) and types (with their parent type). Function bodies are skipped, since every declaration is
+found with a single regex scan over the raw bytes of the file.
+
+The index of each file is cached next to it (with JASS_CACHE_EXTENSION appended to its name), keyed by a hash of the
+file's contents (see editorfiles.cache).
+"""
+from collections import namedtuple
+import hashlib
+import re
+
+from cache import load_cache, store_cache
+
+
+# Must be incremented whenever a change to the scanner changes its output.
+JASS_INDEX_VERSION = 1
+
+JASS_CACHE_EXTENSION = '.jcache'
+
+# The types that are not declared by a type statement.
+PRIMITIVE_TYPES = frozenset(['integer', 'real', 'boolean', 'string', 'handle', 'code'])
+
+
+JassFunction = namedtuple('JassFunction', ['name', 'argument_types', 'return_type', 'native'])
+"""
+A native or function declaration. argument_types is a tuple, which is empty for functions that take nothing.
+"""
+
+
+_FUNCTION = re.compile(r'^[ \t]*(?:constant[ \t]+)?(native|function)[ \t]+(\w+)[ \t]+takes[ \t]+(.*?)[ \t]+returns'
+                       r'[ \t]+(\w+)', flags=re.MULTILINE)
+_TYPE = re.compile(r'^[ \t]*type[ \t]+(\w+)[ \t]+extends[ \t]+(\w+)', flags=re.MULTILINE)
+
+
+def scan_jass(data):
+    # type: (str) -> tuple[list[JassFunction], dict[str, str]]
+    """
+    Returns the declarations of a JASS file.
+
+    :param data: The raw contents of the file.
+    :return: A (functions, types) tuple, where types maps the name of each declared type to its parent type.
+    """
+    functions = []
+    for match in _FUNCTION.finditer(data):
+        kind, name, parameters, return_type = match.groups()
+        if parameters.strip() == 'nothing':
+            argument_types = ()
+        else:
+            argument_types = tuple(intern(parameter.split()[0]) for parameter in parameters.split(','))
+        functions.append(JassFunction(intern(name), argument_types, intern(return_type), kind == 'native'))
+
+    types = {intern(match.group(1)): intern(match.group(2)) for match in _TYPE.finditer(data)}
+    return functions, types
+
+
+def read_jass_file(path):
+    # type: (str) -> tuple[list[JassFunction], dict[str, str]]
+    """Same as scan_jass, but reads a file from its path and uses its cache file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+
+    declarations = load_cache(path + JASS_CACHE_EXTENSION, JASS_INDEX_VERSION, digest)
+    if declarations is None:
+        declarations = scan_jass(data)
+        store_cache(path + JASS_CACHE_EXTENSION, JASS_INDEX_VERSION, digest, declarations)
+    return declarations
+
+
+class JassIndex(object):
+    """
+    The natives, functions and types declared by a set of JASS files, usually common.j and Blizzard.j. If a name is
+    declared by more than one file, the declaration of the file added last is used.
+    """
+
+    def __init__(self, *paths):
+        self.functions = {}  # type: dict[str, JassFunction]
+        self.types = {}  # type: dict[str, str]
+        for path in paths:
+            self.add_file(path)
+
+    def add_file(self, path):
+        functions, types = read_jass_file(path)
+        self.functions.update((function.name, function) for function in functions)
+        self.types.update(types)
+
+    def __contains__(self, name):
+        return name in self.functions
+
+    def get(self, name):
+        # type: (str) -> JassFunction
+        return self.functions.get(name)
+
+    def is_type(self, name):
+        # type: (str) -> bool
+        return name in PRIMITIVE_TYPES or name in self.types
+
+    def is_assignable(self, from_type, to_type):
+        # type: (str, str) -> bool
+        """
+        Returns whether a value of from_type can be passed as an argument of to_type: either it is the same type, a
+        type that extends it, or an integer passed as a real.
+        """
+        if from_type == to_type or (from_type == 'integer' and to_type == 'real'):
+            return True
+        seen = set()
+        while from_type in self.types and from_type not in seen:
+            seen.add(from_type)
+            from_type = self.types[from_type]
+            if from_type == to_type:
+                return True
+        return False
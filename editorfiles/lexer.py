@@ -0,0 +1,123 @@
+"""
+This module contains the lexer used to read files in the TriggerData.txt format.
+
+Every line is scanned exactly once: comments are cut, whitespace outside of quoted text is removed and the line is
+classified as a section header, a declaration or a block member. Quoted text may be delimited by double quotes ("),
+single quotes (') or backticks (`). Comment markers (//) inside quoted text are kept.
+"""
+from collections import namedtuple
+import re
+
+
+INDICATOR_CATEGORY = '['
+INDICATOR_BLOCK_MEMBER = '_'
+
+TOKEN_SECTION = 'section'
+TOKEN_DECLARATION = 'declaration'
+TOKEN_BLOCK_MEMBER = 'block-member'
+
+
+class LineRecord(namedtuple('LineRecord', ['key', 'param', 'data'])):
+    """
+    The fields of a minimized declaration or block member line (see parse_line).
+
+    key:    The text before the first equals sign.
+    param:  For block members (_Name_Param=...), the name of the block parameter. None for declarations.
+    data:   The text after the first equals sign.
+    values: The list of comma separated values in data. It is split again every time it is accessed.
+
+    The lexer yields lines as plain strings. Records are only built for the lines that are parsed into objects, so
+    reading or indexing a file does not pay for them.
+    """
+    __slots__ = ()
+
+    @property
+    def values(self):
+        # type: () -> list
+        return self.data.split(',')
+
+
+# Building records and tokens through tuple.__new__ skips the argument handling of the namedtuple constructor.
+_new_tuple = tuple.__new__
+
+
+def parse_line(text):
+    # type: (unicode) -> LineRecord
+    """Splits a minimized declaration or block member line into a LineRecord."""
+    key, _, data = text.partition('=')
+    return _new_tuple(LineRecord, (key, key.rpartition('_')[2] if key[:1] == INDICATOR_BLOCK_MEMBER else None, data))
+
+
+class Token(namedtuple('Token', ['kind', 'line_number', 'text'])):
+    """
+    A single non-empty line of a TriggerData file.
+
+    kind:        One of TOKEN_SECTION, TOKEN_DECLARATION or TOKEN_BLOCK_MEMBER.
+    line_number: The line of the source file (starting at 1) the token was read from.
+    text:        The minimized line (without comments and whitespace).
+    """
+    __slots__ = ()
+
+    @property
+    def key(self):
+        # type: () -> str
+        """The section name for sections, otherwise everything before the first equals sign."""
+        if self.kind == TOKEN_SECTION:
+            return self.text[1:-1]
+        return self.text.partition('=')[0]
+
+    @property
+    def values(self):
+        # type: () -> list
+        """None for sections, otherwise the list of comma separated values after the first equals sign."""
+        if self.kind == TOKEN_SECTION:
+            return None
+        return self.text.partition('=')[2].split(',')
+
+
+# Splitting on this pattern yields the unquoted parts of a line at even indices and quoted strings or comment markers
+# at odd indices. Unterminated quotes are not matched, so they are treated as unquoted text.
+_QUOTED_OR_COMMENT = re.compile(r'("[^"]*"|\'[^\']*\'|`[^`]*`|//)', flags=re.UNICODE)
+
+
+def minimize_line(string):
+    # type: (str) -> str
+    """Removes all comments and whitespace from a line. Whitespace inside quoted text is kept."""
+    if '"' not in string and "'" not in string and '`' not in string:
+        comment = string.find('//')
+        if comment != -1:
+            string = string[:comment]
+        return ''.join(string.split())
+
+    result = []
+    parts = _QUOTED_OR_COMMENT.split(string)
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            result.append(''.join(part.split()))
+        elif part == '//':
+            break
+        else:
+            result.append(part)
+    return ''.join(result)
+
+
+def tokenize(lines, first_line_number=1):
+    """
+    Yields a Token for every line that is not empty after comments and whitespace have been removed.
+
+    :param lines: Any iterable of strings, such as a file handle opened in text mode.
+    :param first_line_number: The line number of the first element of lines.
+    """
+    minimize = minimize_line
+    for line_number, line in enumerate(lines, first_line_number):
+        text = minimize(line)
+        if not text:
+            continue
+
+        first = text[0]
+        if first == INDICATOR_CATEGORY:
+            yield _new_tuple(Token, (TOKEN_SECTION, line_number, text))
+        elif first == INDICATOR_BLOCK_MEMBER:
+            yield _new_tuple(Token, (TOKEN_BLOCK_MEMBER, line_number, text))
+        else:
+            yield _new_tuple(Token, (TOKEN_DECLARATION, line_number, text))
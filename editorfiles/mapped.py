@@ -0,0 +1,214 @@
+"""
+This module contains a reader that memory-maps files in the TriggerData.txt format.
+
+Instead of decoding a file line by line, the whole file is mapped into memory and the offsets of every line, section
+header and block are found in bulk over the raw bytes. A block's lines are only decoded when the block is requested.
+
+If NumPy is installed, the offsets are computed with vectorized operations. Otherwise, a regex scan over the mapped
+buffer is used.
+"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import codecs
+import mmap
+import re
+
+from my_exceptions import TriggerSyntaxException
+from lexer import tokenize, minimize_line, INDICATOR_CATEGORY, INDICATOR_BLOCK_MEMBER
+from encoding import resolve_encoding, BOMS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_NEWLINE = re.compile(r'\n')
+
+# Lines starting with one of these bytes cannot start a block. Every other line is the declaration of a new block.
+_NOT_BLOCK_START = '[_/ \t\r\n\f\v'
+
+if numpy is not None:
+    _NOT_BLOCK_START_TABLE = numpy.zeros(256, dtype=bool)
+    _NOT_BLOCK_START_TABLE[[ord(char) for char in _NOT_BLOCK_START]] = True
+
+
+def _index_with_numpy(buffer, begin):
+    """Returns the start offsets of all lines, of section header lines and of block declaration lines."""
+    data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    newlines = numpy.flatnonzero(data[begin:] == ord('\n')) + begin
+
+    starts = numpy.concatenate(([begin], newlines + 1))
+    starts = starts[starts < len(data)]
+    first_bytes = data[starts]
+
+    headers = starts[first_bytes == ord('[')]
+    blocks = starts[~_NOT_BLOCK_START_TABLE[first_bytes]]
+    return starts.tolist(), headers.tolist(), blocks.tolist()
+
+
+def _index_with_regex(buffer, begin):
+    """Returns the start offsets of all lines, of section header lines and of block declaration lines."""
+    starts = [begin]
+    starts.extend(match.end() for match in _NEWLINE.finditer(buffer, begin))
+    if starts[-1] >= len(buffer):
+        starts.pop()
+
+    headers = [start for start in starts if buffer[start] == '[']
+    blocks = [start for start in starts if buffer[start] not in _NOT_BLOCK_START]
+    return starts, headers, blocks
+
+
+class MappedFile(object):
+    """
+    A read-only, memory-mapped text file. The object should be closed when it is no longer used, either by calling
+    close() or by using it as a context manager.
+
+    If encoding is None, it is detected from the start of the file (see editorfiles.encoding). Only encodings in
+    which line breaks are single ASCII bytes are supported, so UTF-16 files are rejected with a ValueError. bom is True
+    if the file starts with the byte order mark of its encoding.
+
+    Subclasses scan the mapped bytes in _index, which is called once the encoding is known. If opening the file
+    fails, the file is closed before the exception is raised.
+    """
+
+    def __init__(self, path, encoding=None):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._buffer = ''
+        try:
+            try:
+                self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files cannot be mapped.
+                pass
+
+            self.encoding, self.bom = resolve_encoding(self._buffer, encoding)
+            if codecs.lookup(self.encoding).name.startswith('utf-16'):
+                raise ValueError('UTF-16 files cannot be memory-mapped.')
+            self._index()
+        except Exception:
+            self.close()
+            raise
+
+    def _index(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+
+class MappedTriggerData(MappedFile):
+    """
+    A read-only, memory-mapped view of a file in the TriggerData.txt format (see MappedFile).
+
+    Section headers must start at the beginning of a line. Only encodings in which the characters that start sections
+    and block members are single ASCII bytes are supported. A block that cannot be decoded raises a
+    TriggerSyntaxException when it is read.
+    """
+
+    def _index(self):
+        begin = len(BOMS[self.encoding]) if self.bom else 0
+        if numpy is not None:
+            self._line_starts, headers, self._block_starts = _index_with_numpy(self._buffer, begin)
+        else:
+            self._line_starts, headers, self._block_starts = _index_with_regex(self._buffer, begin)
+
+        self._sections = OrderedDict()
+        for index, start in enumerate(headers):
+            end = headers[index + 1] if index + 1 < len(headers) else len(self._buffer)
+            header_end = self._line_end(start)
+            name = minimize_line(self._decode(start, header_end))[1:-1]
+            if name in self._sections:
+                raise TriggerSyntaxException('Category ' + name + ' already exists!')
+            self._sections[name] = (header_end, end)
+
+    @property
+    def sections(self):
+        # type: () -> list[str]
+        """The names of all sections, in the order they appear in the file."""
+        return self._sections.keys()
+
+    def section_range(self, name):
+        # type: (str) -> tuple[int, int]
+        """Returns the byte range of a section's contents, excluding the section header."""
+        return self._sections[name]
+
+    def section_line_number(self, name):
+        # type: (str) -> int
+        """Returns the line number of a section's header."""
+        return self.line_number(self._sections[name][0])
+
+    def line_number(self, offset):
+        # type: (int) -> int
+        """Returns the line number (starting at 1) of the line that contains the byte at offset."""
+        return max(1, bisect_right(self._line_starts, offset))
+
+    def iter_tokens(self, name):
+        """
+        Yields the Tokens of a section. Each block is decoded only when the generator reaches it.
+        """
+        for start, end in self._iter_chunks(name):
+            for token in tokenize(self._decode(start, end).split('\n'), self.line_number(start)):
+                yield token
+
+    def iter_blocks(self, name):
+        """
+        Yields the blocks of a section as lists of minimized lines, in the same format used by BlockParser. Each block
+        is decoded only when the generator reaches it.
+        """
+        for _, block in self.iter_numbered_blocks(name):
+            yield block
+
+    def iter_numbered_blocks(self, name):
+        """Same as iter_blocks, but yields (line_number, block) tuples, where line_number is the block's first line."""
+        minimize = minimize_line
+        block = None
+        block_line_number = None
+        for start, end in self._iter_chunks(name):
+            for line_number, line in enumerate(self._decode(start, end).split('\n'), self.line_number(start)):
+                text = minimize(line)
+                if not text:
+                    continue
+                if text[0] == INDICATOR_BLOCK_MEMBER:
+                    if block is None:
+                        raise TriggerSyntaxException('Block member found outside block!')
+                    block.append(text)
+                elif text[0] == INDICATOR_CATEGORY:
+                    raise TriggerSyntaxException('Section headers must start at the beginning of a line!')
+                else:
+                    if block is not None:
+                        yield block_line_number, block
+                    block = [text]
+                    block_line_number = line_number
+        if block is not None:
+            yield block_line_number, block
+
+    def _iter_chunks(self, name):
+        """Yields the byte ranges of a section that start at a block declaration (the first one may not)."""
+        start, end = self._sections[name]
+        low = bisect_left(self._block_starts, start)
+        high = bisect_left(self._block_starts, end)
+        boundaries = [start] + self._block_starts[low:high] + [end]
+
+        for index in xrange(len(boundaries) - 1):
+            if boundaries[index] != boundaries[index + 1]:
+                yield boundaries[index], boundaries[index + 1]
+
+    def _line_end(self, start):
+        end = self._buffer.find('\n', start)
+        return len(self._buffer) if end == -1 else end
+
+    def _decode(self, start, end):
+        try:
+            return self._buffer[start:end].decode(self.encoding)
+        except UnicodeDecodeError as error:
+            raise TriggerSyntaxException('Line %d cannot be decoded as %s: %s.'
+                                         % (self.line_number(start + error.start), self.encoding, error.reason))
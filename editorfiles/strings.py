@@ -0,0 +1,119 @@
+"""
+This module contains a reader for string tables in the format of WorldEditStrings.txt, which define the text of the
+WESTRING_* keys used as display text in TriggerData.txt:
+
+    [WorldEditStrings]
+    WESTRING_TRIGCAT_UNIT=Unit
+    WESTRING_TRIGCAT_AI="AI - "
+
+String files are memory-mapped and only their keys are read when they are opened. Keys are interned and mapped to the
+offset of their value, and the value of a key is decoded the first time it is looked up. Keys are looked up in every
+section of a file.
+
+A StringTable is a stack of string files. Files added later (for example, by packages) are overlays: their values
+take precedence over the values of the files below them.
+"""
+import codecs
+import re
+
+from mapped import MappedFile
+
+
+# Matches the key of every line that declares a value. Comment lines (//) and section headers ([) are not matched.
+_KEY = re.compile(r'^(?:' + re.escape(codecs.BOM_UTF8) + r')?[ \t]*([^\s=\[/][^\s=]*)[ \t]*=', flags=re.MULTILINE)
+
+
+class StringFile(MappedFile):
+    """
+    A read-only, memory-mapped string file (see editorfiles.mapped.MappedFile).
+    """
+
+    def _index(self):
+        # If a key is declared more than once, the last declaration is used.
+        self._offsets = {intern(match.group(1)): match.end() for match in _KEY.finditer(self._buffer)}
+        self._values = {}
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def keys(self):
+        # type: () -> list[str]
+        return self._offsets.keys()
+
+    def get(self, key, default=None):
+        # type: (str, unicode) -> unicode
+        """Returns the value of a key, decoding it if it has not been looked up before."""
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        try:
+            start = self._offsets[key]
+        except KeyError:
+            return default
+
+        end = self._buffer.find('\n', start)
+        value = self._buffer[start:end if end != -1 else len(self._buffer)].decode(self.encoding).strip()
+        if len(value) > 1 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        self._values[key] = value
+        return value
+
+
+class StringTable(object):
+    """
+    Resolves keys through a stack of StringFiles. The file added last is searched first.
+    """
+
+    def __init__(self, path=None, encoding=None):
+        self._files = []  # type: list[StringFile]
+        if path is not None:
+            self.add_overlay(path, encoding)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        for string_file in self._files:
+            string_file.close()
+        self._files = []
+
+    def add_overlay(self, path, encoding=None):
+        # type: (str, str) -> StringFile
+        """Opens a string file and puts it on top of the stack. Returns the StringFile, so it can be removed later."""
+        string_file = StringFile(path, encoding)
+        self._files.append(string_file)
+        return string_file
+
+    def remove_overlay(self, string_file):
+        # type: (StringFile) -> None
+        """Removes a StringFile returned by add_overlay from the stack and closes it."""
+        self._files.remove(string_file)
+        string_file.close()
+
+    def __contains__(self, key):
+        return any(key in string_file for string_file in self._files)
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        # type: (str, unicode) -> unicode
+        for string_file in reversed(self._files):
+            if key in string_file:
+                return string_file.get(key)
+        return default
+
+    def resolve(self, text):
+        # type: (str) -> unicode
+        """Returns the value of text if it is a key of the table. Otherwise, text is returned unchanged."""
+        return self.get(text, text)
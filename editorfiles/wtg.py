@@ -0,0 +1,217 @@
+"""
+This module contains a streaming reader for war3map.wtg files, which store the GUI triggers of a map in a binary format.
+
+The file is read in chunks, so only one trigger is kept in memory at a time. All integers are 32-bit little-endian and
+all strings are null-terminated. Two versions of the format are supported: 4 (Reign of Chaos) and 7 (The Frozen
+Throne), which adds comments, variable array sizes, child ECAs (the actions of If/Then/Else and loops) and an unknown
+integer after every function call used as a parameter.
+
+    char[4]: 'WTG!'
+    int:     version
+    int:     number of categories, followed by the categories
+    int:     unknown (always 2)
+    int:     number of variables, followed by the variables
+    int:     number of triggers, followed by the triggers
+
+The number of parameters of a function is not stored in the file: it must be looked up in TriggerData. That is why the
+reader needs a function which returns the number of arguments of the events, conditions, actions and calls that are
+used, and why it cannot continue past a function that is not defined.
+"""
+from collections import namedtuple
+import struct
+
+from my_exceptions import TriggerSyntaxException
+from encoding import decode_bytes
+
+
+WTG_MAGIC = 'WTG!'
+WTG_VERSION_ROC = 4
+WTG_VERSION_TFT = 7
+WTG_VERSIONS = (WTG_VERSION_ROC, WTG_VERSION_TFT)
+
+# The kinds of functions. Events, conditions and actions are ECAs. Calls are functions used as parameters.
+FUNCTION_EVENT = 0
+FUNCTION_CONDITION = 1
+FUNCTION_ACTION = 2
+FUNCTION_CALL = 3
+
+# The kinds of parameters.
+PARAMETER_INVALID = -1
+PARAMETER_PRESET = 0
+PARAMETER_VARIABLE = 1
+PARAMETER_FUNCTION = 2
+PARAMETER_STRING = 3
+
+_CHUNK_SIZE = 1 << 16
+_INT = struct.Struct('<i')
+
+
+WtgCategory = namedtuple('WtgCategory', ['index', 'name', 'is_comment'])
+
+WtgVariable = namedtuple('WtgVariable', ['name', 'type', 'is_array', 'array_size', 'is_initialized',
+                                         'initial_value'])
+"""A global variable. array_size is None in version 4 files."""
+
+WtgTrigger = namedtuple('WtgTrigger', ['name', 'description', 'is_comment', 'enabled', 'is_custom_text',
+                                       'initially_off', 'run_on_map_init', 'category', 'functions'])
+"""A trigger. functions is the list of its ECAs (WtgFunctions), in file order."""
+
+WtgFunction = namedtuple('WtgFunction', ['kind', 'name', 'enabled', 'parameters', 'branch', 'children'])
+"""
+An ECA, or a call used as a parameter. enabled is None for calls. branch is the group of a child ECA (for example, the
+Then or Else part of an If/Then/Else) and None for other functions. children is the list of child ECAs.
+"""
+
+WtgParameter = namedtuple('WtgParameter', ['kind', 'value', 'call', 'index'])
+"""
+A parameter of a function. call is the WtgFunction of PARAMETER_FUNCTION parameters and None otherwise. index is the
+WtgParameter used as the array index of an array variable, or None.
+"""
+
+
+class UndefinedFunctionError(TriggerSyntaxException):
+    """Raised when a function whose number of arguments is not known is found. The file cannot be read past it."""
+
+    def __init__(self, kind, name):
+        super(UndefinedFunctionError, self).__init__('Symbol ' + name + ' is not defined.')
+        self.kind = kind
+        self.name = name
+
+
+class _Stream(object):
+    """Reads integers and null-terminated strings from a file object, one chunk at a time."""
+
+    def __init__(self, f, chunk_size=_CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._position = 0
+
+    def _read_chunk(self, size):
+        data = self._file.read(max(size, self._chunk_size))
+        if not data:
+            raise TriggerSyntaxException('Unexpected end of file.')
+        self._buffer = self._buffer[self._position:] + data
+        self._position = 0
+
+    def read_bytes(self, size):
+        # type: (int) -> str
+        while len(self._buffer) - self._position < size:
+            self._read_chunk(size)
+        value = self._buffer[self._position:self._position + size]
+        self._position += size
+        return value
+
+    def read_int(self):
+        # type: () -> int
+        while len(self._buffer) - self._position < 4:
+            self._read_chunk(4)
+        value = _INT.unpack_from(self._buffer, self._position)[0]
+        self._position += 4
+        return value
+
+    def read_string(self):
+        # type: () -> unicode
+        end = self._buffer.find('\0', self._position)
+        while end == -1:
+            searched = len(self._buffer) - self._position
+            self._read_chunk(0)
+            end = self._buffer.find('\0', searched)
+        value = self._buffer[self._position:end]
+        self._position = end + 1
+        return decode_bytes(value)[0]
+
+
+class WtgReader(object):
+    """
+    Reads a war3map.wtg file from a file object opened in binary mode. The header, categories and variables are read
+    when the reader is created. The triggers are read one at a time, while iterating over the reader.
+
+    :param get_argument_count: A function that takes the kind of a function (FUNCTION_EVENT, FUNCTION_CONDITION,
+    FUNCTION_ACTION or FUNCTION_CALL) and its name, and returns its number of arguments, or None if it is not defined.
+    """
+
+    def __init__(self, f, get_argument_count):
+        self._stream = _Stream(f)
+        self._get_argument_count = get_argument_count
+
+        if self._stream.read_bytes(4) != WTG_MAGIC:
+            raise TriggerSyntaxException('Not a war3map.wtg file.')
+        self.version = self._stream.read_int()
+        if self.version not in WTG_VERSIONS:
+            raise TriggerSyntaxException('Version %d of the war3map.wtg format is not supported.' % self.version)
+
+        read_int = self._stream.read_int
+        read_string = self._stream.read_string
+        is_tft = self.version == WTG_VERSION_TFT
+
+        self.categories = []  # type: list[WtgCategory]
+        for _ in xrange(read_int()):
+            self.categories.append(WtgCategory(read_int(), read_string(), bool(read_int()) if is_tft else False))
+
+        read_int()  # Unknown (always 2).
+        self.variables = []  # type: list[WtgVariable]
+        for _ in xrange(read_int()):
+            name, type_ = read_string(), read_string()
+            read_int()  # Unknown (always 1).
+            is_array = bool(read_int())
+            array_size = read_int() if is_tft else None
+            self.variables.append(WtgVariable(name, type_, is_array, array_size, bool(read_int()), read_string()))
+
+        self.trigger_count = read_int()
+        self._read_triggers = 0
+
+    def __iter__(self):
+        """Yields the WtgTriggers that have not been read yet."""
+        read_int = self._stream.read_int
+        read_string = self._stream.read_string
+        is_tft = self.version == WTG_VERSION_TFT
+
+        while self._read_triggers < self.trigger_count:
+            name, description = read_string(), read_string()
+            is_comment = bool(read_int()) if is_tft else False
+            enabled, is_custom_text, initially_off, run_on_map_init = (bool(read_int()) for _ in xrange(4))
+            category = read_int()
+            functions = [self._read_eca(False) for _ in xrange(read_int())]
+            self._read_triggers += 1
+            yield WtgTrigger(name, description, is_comment, enabled, is_custom_text, initially_off, run_on_map_init,
+                             category, functions)
+
+    def _argument_count(self, kind, name):
+        count = self._get_argument_count(kind, name)
+        if count is None:
+            raise UndefinedFunctionError(kind, name)
+        return count
+
+    def _read_eca(self, is_child):
+        read_int = self._stream.read_int
+        kind = read_int()
+        branch = read_int() if is_child else None
+        name = self._stream.read_string()
+        enabled = bool(read_int())
+        parameters = [self._read_parameter() for _ in xrange(self._argument_count(kind, name))]
+        children = []
+        if self.version == WTG_VERSION_TFT:
+            children = [self._read_eca(True) for _ in xrange(read_int())]
+        return WtgFunction(kind, name, enabled, parameters, branch, children)
+
+    def _read_call(self):
+        read_int = self._stream.read_int
+        kind = read_int()
+        name = self._stream.read_string()
+        parameters = []
+        if read_int():
+            parameters = [self._read_parameter() for _ in xrange(self._argument_count(kind, name))]
+        return WtgFunction(kind, name, None, parameters, None, [])
+
+    def _read_parameter(self):
+        read_int = self._stream.read_int
+        kind = read_int()
+        value = self._stream.read_string()
+        call = None
+        if read_int():
+            call = self._read_call()
+            if self.version == WTG_VERSION_TFT:
+                read_int()  # Unknown (always 0).
+        index = self._read_parameter() if read_int() else None
+        return WtgParameter(kind, value, call, index)
@@ -1,5 +1,7 @@
 # noinspection PyUnresolvedReferences
-from _classes.we_object import TriggerEditorObject
+from _classes.workspace import Workspace, WorkspaceAttribute
+# noinspection PyUnresolvedReferences
+from _classes.we_object import TriggerEditorObject, TrustedBatch
 # noinspection PyUnresolvedReferences
 from _classes.we_function import TriggerEditorFunction
 # noinspection PyUnresolvedReferences
@@ -13,11 +15,30 @@ from _classes.we_category import TriggerCategory
 # noinspection PyUnresolvedReferences
 from _classes.we_condition import TriggerCondition
 # noinspection PyUnresolvedReferences
-from _classes.block_parser import TriggerEditorObjectParser
+from _classes.we_param import TriggerParam
+# noinspection PyUnresolvedReferences
+from _classes.we_event import TriggerEvent, IMPLICIT_ARGUMENT_TYPE
+# noinspection PyUnresolvedReferences
+from _classes.blockparameters import BlockParameterSchema, BlockParameterDict, BLOCK_PARAMETER_SCHEMAS, \
+    register_block_parameter
+# noinspection PyUnresolvedReferences
+from _classes.block_parser import TriggerEditorObjectParser, parse_blocks, INVALID_BLOCK_ERRORS
 # noinspection PyUnresolvedReferences
 from _classes.we_call import TriggerCall
+# noinspection PyUnresolvedReferences
+from _classes.incremental import IncrementalLoader, ReloadSummary
+# noinspection PyUnresolvedReferences
+from _classes.diagnostics import Diagnostic, DiagnosticReport, SEVERITY_ERROR, SEVERITY_WARNING
+# noinspection PyUnresolvedReferences
+from _classes.parse_cache import load_parsed_sections, file_digest, PARSER_VERSION, CACHE_EXTENSION
+# noinspection PyUnresolvedReferences
+from _classes.trusted import trust_file, is_trusted_file, TRUSTED_DIGESTS
 
+# noinspection PyUnresolvedReferences
+from _classes.default_triggers import DefaultTriggerList, DefaultTrigger, DefaultTriggerCategory, \
+    DefaultTriggerFunction, DEFAULT_TRIGGER_SECTIONS
+# noinspection PyUnresolvedReferences
+from _classes.script_check import check_script_functions, get_script_name, EDITOR_FUNCTIONS
+# noinspection PyUnresolvedReferences
+from _classes.map_usage import MapUsage, read_map_usage
 
-for subclass_ in TriggerEditorObject.get_subclasses():
-    TriggerEditorObject._class_sets[subclass_] = set()
-    TriggerEditorObject._class_sets[TriggerEditorObject] = set()
@@ -7,25 +7,32 @@ from we_call import TriggerCall
 from we_action import TriggerAction
 from we_category import TriggerCategory
 from we_condition import TriggerCondition
-from we_unknown import TriggerEditorUnknown
+from we_param import TriggerParam
+from we_event import TriggerEvent
+from we_function import TriggerEditorFunction
+from diagnostics import SEVERITY_ERROR
+from utilities import as_record
 
 
+# The exceptions raised when parsing or building an invalid block. parse_from_text raises a ValueError for values that
+# are not numbers and an IndexError for missing values.
+INVALID_BLOCK_ERRORS = (TriggerSyntaxException, ValueError, IndexError)
+
 class TriggerEditorObjectParser(object):
     _DICT_STR2CLASS = OrderedDict({
         u'TriggerCategories': TriggerCategory,
         u'TriggerTypes':               TriggerType,
         u'TriggerTypeDefaults':      TriggerTypeDefault,
-        u'TriggerParams':            TriggerEditorUnknown,
-        u'TriggerEvents':            TriggerEditorUnknown,
+        u'TriggerParams':              TriggerParam,
+        u'TriggerEvents':              TriggerEvent,
         u'TriggerConditions':          TriggerCondition,
         u'TriggerActions':             TriggerAction,
         u'TriggerCalls':               TriggerCall,
-        u'DefaultTriggerCategories': TriggerEditorUnknown,
-        u'DefaultTriggers':          TriggerEditorUnknown
     })
 
     def __init__(self, string=''):
         self._class = None
+        self._is_function = False
         self._type_name = string
         if string:
             self.type_name = string
@@ -33,6 +40,84 @@ class TriggerEditorObjectParser(object):
     def parse_block_to_object(self, block):
         return self._class(**self._class.parse_from_text(block))
 
+    def update_object(self, obj, block):
+        """Re-initializes an existing object from a block. The object is left unchanged if the block is invalid."""
+        obj.update(**self._class.parse_from_text(block))
+
+    def parse_block_to_kwargs(self, block):
+        # type: (list) -> tuple[dict, list]
+        """
+        Parses a block without creating an object or looking up any other object.
+
+        Returns a tuple (kwargs, block_params), where block_params is a list of (parameter, string) tuples which are
+        converted by the function's block parameter schema when the object is created. The result only contains plain
+        data, so it can be stored in the parse cache (see load_parsed_sections). Use build_object to create the object.
+        """
+        if not self._is_function:
+            return self._class.parse_from_text(block), []
+
+        kwargs = self._class.parse_from_text(block[:1])
+        block_params = [(record.param, record.data) for record in (as_record(line) for line in block[1:])]
+        return kwargs, block_params
+
+    def build_object(self, parsed):
+        """
+        Creates an object from the result of parse_block_to_kwargs.
+
+        If parsing the block raised an exception (see parse_blocks), parsed is that exception and it is raised here.
+        """
+        if isinstance(parsed, Exception):
+            raise parsed
+
+        kwargs, block_params = parsed
+        if block_params:
+            # parsed may be held by the parse cache, so its kwargs must not be changed.
+            kwargs = dict(kwargs)
+            kwargs.update(block_params)
+        return self._class(**kwargs)
+
+    def parse_block_to_row(self, block):
+        # type: (list) -> tuple
+        """Parses a block into the tuple used to build trusted objects (see TriggerEditorObject.parse_row)."""
+        return self._class.parse_row(block)
+
+    def build_trusted_objects(self, rows):
+        # type: (list) -> list
+        """
+        Creates the objects of a whole section from the results of parse_block_to_row, without checking them, and
+        registers them in bulk (see TriggerEditorObject.build_trusted). Only use this for files that are known to be
+        valid (see is_trusted_file): if any block is invalid, its exception is raised and none of the objects are
+        registered.
+        """
+        for row in rows:
+            if isinstance(row, Exception):
+                raise row
+        return self._class.build_trusted(rows)
+
+    def diagnose(self, parsed):
+        # type: (tuple | Exception) -> list[tuple[str, str]]
+        """
+        Returns a (message, severity) tuple for every problem found in the result of parse_block_to_kwargs, without
+        creating the object and without raising any exceptions (see TriggerEditorObject.check_kwargs). Blocks with
+        errors should not be built. Blocks with only warnings can be.
+        """
+        if isinstance(parsed, IndexError):
+            return [('The declaration is missing values.', SEVERITY_ERROR)]
+        if isinstance(parsed, Exception):
+            return [(str(parsed) or type(parsed).__name__, SEVERITY_ERROR)]
+
+        kwargs, block_params = parsed
+        if block_params:
+            kwargs = dict(kwargs)
+            kwargs.update(block_params)
+        return list(self._class.check_kwargs(kwargs))
+
+    @classmethod
+    def supports(cls, type_name):
+        # type: (str) -> bool
+        """Returns whether a section name is recognized."""
+        return type_name in cls._DICT_STR2CLASS
+
     @property
     def type_name(self):
         return self._type_name
@@ -43,4 +128,28 @@ class TriggerEditorObjectParser(object):
             self._class = self._DICT_STR2CLASS[string]
         except KeyError:
             raise TriggerSyntaxException("This trigger editor class is not recognized.")
+        self._is_function = issubclass(self._class, TriggerEditorFunction)
         self._type_name = string
+
+
+# ======================================================================================================================
+# Section parsing
+# ======================================================================================================================
+
+def parse_blocks(type_name, blocks, trusted=False):
+    # type: (str, list, bool) -> list
+    """
+    Parses a list of blocks with TriggerEditorObjectParser.parse_block_to_kwargs, or with parse_block_to_row if trusted
+    is True. If parsing a block raises an exception, the exception is returned in place of that block's result, so it
+    can be raised by build_object or build_trusted_objects.
+    """
+    parser = TriggerEditorObjectParser(type_name)
+    parse = parser.parse_block_to_row if trusted else parser.parse_block_to_kwargs
+
+    results = []
+    for block in blocks:
+        try:
+            results.append(parse(block))
+        except Exception as error:
+            results.append(error)
+    return results
@@ -7,12 +7,16 @@ The classes contained in this module are used to represent block parameters of t
 """
 
 import abc
+import weakref
+
+from we_object import TriggerEditorObject
+from my_types import IntBool
+from my_collections import ValidatedDict
+
 
 # ======================================================================================================================
 # Abstract and Generic classes
 # ======================================================================================================================
-from we_object import TriggerEditorObject
-
 
 class BlockParameter(object):
     """
@@ -35,12 +39,30 @@ class BlockParameter(object):
 # Specific classes
 # ======================================================================================================================
 class ListParameter(BlockParameter):
-    """Base class for block paramaters that are lists (Defaults and Limits)"""
+    """
+    Base class for block paramaters that are lists (Defaults and Limits).
+
+    Instances are immutable and shared: every subclass keeps a tracker of the instances it has created, and creating a
+    list from a string that has already been seen returns the same instance. Trackers only hold weak references, so
+    instances are freed when no function uses them anymore.
+    """
+    tracker = None  # type: dict
+
+    def __new__(cls, string):
+        try:
+            return cls.tracker[string]
+        except KeyError:
+            self = super(ListParameter, cls).__new__(cls)
+            object.__setattr__(self, '_data', tuple(x.strip() for x in string.split(',')))
+            cls.tracker[string] = self
+            return self
 
     # noinspection PyMissingConstructor
     def __init__(self, string):
-        self._data = string.split(',')
-        self._data = [x.strip() for x in self._data]
+        pass
+
+    def __setattr__(self, key, value):
+        raise AttributeError(type(self).__name__ + ' objects are immutable.')
 
     def __str__(self):
         return ','.join(self._data)
@@ -56,7 +78,7 @@ class ParamCategory(BlockParameter):
 
     # noinspection PyMissingConstructor
     def __init__(self, string):
-        self._data = TriggerEditorObject.get_object_from_name(string)
+        self._data = TriggerEditorObject.get_object_from_name(string, u'TriggerCategories')
 
     def __str__(self):
         return self._data.name
@@ -75,37 +97,157 @@ class ParamCategory(BlockParameter):
 
 
 class ParamLimits(ListParameter):
+    tracker = weakref.WeakValueDictionary()
+
     @staticmethod
     def type():
         return "Limits"
 
 
 class ParamDefaults(ListParameter):
+    tracker = weakref.WeakValueDictionary()
+
     @staticmethod
     def type():
         return "Defaults"
 
+
+# ======================================================================================================================
+# Schemas
 # ======================================================================================================================
 
+class BlockParameterSchema(object):
+    """
+    The block parameters that are valid for the functions of a section, mapped to the callable that converts the text
+    of each parameter into its value. Parsers are looked up once per block parameter, with a single dict access.
+    """
+
+    def __init__(self, parsers):
+        # type: (dict) -> None
+        self.parsers = dict(parsers)
+
+    def __contains__(self, parameter):
+        return parameter in self.parsers
+
+    def __iter__(self):
+        return iter(self.parsers)
+
+    def __len__(self):
+        return len(self.parsers)
+
+    def register(self, parameter, parser=str):
+        """
+        Adds a block parameter to the schema, or replaces the parser of an existing one.
+
+        :param parameter: The name of the parameter, as written after the function name (_Function_Parameter=).
+        :param parser: A callable that takes the text after the equals sign and returns the parameter's value. Its
+        result must be converted back to the same text by str().
+        """
+        self.parsers[parameter] = parser
+
+    def parse(self, parameter, string):
+        """Converts a block parameter to its value. Parameters that are not in the schema are returned as strings."""
+        parser = self.parsers.get(parameter)
+        return parser(string) if parser is not None else string
 
-_STRING_2_BLOCK_PARAM = {
-    'Defaults':   ParamDefaults,
-    'Limits':     ParamLimits,
-    'Category':   ParamCategory,
-    'ScriptName': str
+
+_COMMON_BLOCK_PARAMETERS = {
+    'Defaults': ParamDefaults,
+    'Limits':   ParamLimits,
+    'Category': ParamCategory,
+}
+
+# The block parameters of each function section. UseWithAI and AIDefaults are used by conditions and calls that can be
+# used by the AI Editor.
+BLOCK_PARAMETER_SCHEMAS = {
+    u'TriggerEvents':     BlockParameterSchema(_COMMON_BLOCK_PARAMETERS),
+    u'TriggerConditions': BlockParameterSchema(dict(_COMMON_BLOCK_PARAMETERS, UseWithAI=IntBool,
+                                                    AIDefaults=ParamDefaults)),
+    u'TriggerActions':    BlockParameterSchema(dict(_COMMON_BLOCK_PARAMETERS, ScriptName=str)),
+    u'TriggerCalls':      BlockParameterSchema(dict(_COMMON_BLOCK_PARAMETERS, UseWithAI=IntBool)),
 }
 
 
-def parse_block_parameter(parameter, string):
-    """Converts a block parameter to the correct class.
-    :param parameter: This is the name of the parameter (Category, Defaults, Limits).
-    :param string:  This is the string passed as the parameter.
-    :return: If no appropriate class exists, a simple string is returned.
+class BlockParameterDict(ValidatedDict):
+    """
+    The block parameters of a function. Parameters can be given as their text, which is only converted to its value
+    (with the parser of the schema) the first time the parameter is looked up. Until then, only the text is stored, so
+    functions whose block parameters are never inspected (for example, when a file is merged or written) do not pay
+    for parsing them, and categories are not resolved until they are needed. TriggerEditorFunction still checks that
+    the category of a new function is defined.
+
+    If an owner is given, its _block_params_changed method is called whenever a parameter is set or deleted. Only a
+    weak reference to the owner is kept.
     """
-    try:
-        return _STRING_2_BLOCK_PARAM[parameter](string)
-    except KeyError as error:
-        if parameter not in _STRING_2_BLOCK_PARAM:  # Make sure KeyError occurred in the right place.
-            return string
+
+    def __init__(self, schema, map_=None, owner=None):
+        # type: (BlockParameterSchema, dict, TriggerEditorFunction) -> None
+        super(BlockParameterDict, self).__init__(schema)
+        self._unparsed = set()
+        self._owner = weakref.ref(owner) if owner is not None else None
+        if map_:
+            for key in map_:
+                self[key] = map_[key]
+
+    @classmethod
+    def from_valid_map(cls, valid_keys, map_, owner=None):
+        """
+        Creates a BlockParameterDict from a dict whose keys are already known to be valid, without checking them. The
+        values of the dict which are strings are parsed when they are first looked up.
+        """
+        self = cls(valid_keys, owner=owner)
+        self._map = map_
+        self._unparsed = {key for key, value in map_.iteritems() if isinstance(value, basestring)}
+        return self
+
+    # noinspection PyProtectedMember
+    def __getitem__(self, key):
+        if key in self._unparsed:
+            # References (such as categories) are resolved in the workspace of the owner.
+            owner = self._owner() if self._owner is not None else None
+            if owner is not None:
+                with owner._workspace:
+                    self._map[key] = self._valid_keys.parsers[key](self._map[key])
+            else:
+                self._map[key] = self._valid_keys.parsers[key](self._map[key])
+            self._unparsed.discard(key)
+        return super(BlockParameterDict, self).__getitem__(key)
+
+    def __setitem__(self, key, value):
+        super(BlockParameterDict, self).__setitem__(key, value)
+        if isinstance(value, basestring):
+            self._unparsed.add(key)
         else:
-            raise error
+            self._unparsed.discard(key)
+        self._changed()
+
+    def __delitem__(self, key):
+        super(BlockParameterDict, self).__delitem__(key)
+        self._unparsed.discard(key)
+        self._changed()
+
+    # noinspection PyProtectedMember
+    def _changed(self):
+        owner = self._owner() if self._owner is not None else None
+        if owner is not None:
+            owner._block_params_changed()
+
+    def get_text(self, key):
+        # type: (str) -> str
+        """Returns the text of a block parameter, without parsing it. Returns None if the parameter is not set."""
+        if key in self._unparsed:
+            return self._map[key]
+        value = self[key]
+        return str(value) if value is not self.UNINITIALIZED_VALUE else None
+
+    def is_parsed(self, key):
+        # type: (str) -> bool
+        return key not in self._unparsed
+
+
+def register_block_parameter(section, parameter, parser=str):
+    """
+    Makes a new block parameter valid for the functions of a section (see BlockParameterSchema.register). This is used
+    by packages that declare their own block parameters.
+    """
+    BLOCK_PARAMETER_SCHEMAS[section].register(parameter, parser)
@@ -0,0 +1,279 @@
+"""
+This module contains the model of the [DefaultTriggerCategories] and [DefaultTriggers] sections, which define the
+trigger categories and triggers that are automatically added to new maps.
+
+Unlike the other sections, the lines of these sections are not independent declarations. Their keys are numbered
+(Category01, Trigger01Name, Trigger01Action03, NumTriggers...), so they are read together into a DefaultTriggerList.
+The numbers are not stored: they are generated again when the sections are written, so triggers, categories and
+functions can be added, removed or reordered freely.
+
+Example:
+    NumTriggers=1
+    Trigger01Name=WESTRING_MELEEINITIALIZATION
+    Trigger01Comment=WESTRING_MELEEINITIALIZATION_COMMENT
+    Trigger01Category=1
+    Trigger01Events=1
+    Trigger01Event01=MapInitializationEvent
+    Trigger01Conditions=0
+    Trigger01Actions=1
+    Trigger01Action01=MeleeStartingVisibility
+"""
+import re
+
+from my_exceptions import TriggerSyntaxException
+from utilities import as_record
+from we_object import TriggerEditorObject
+from we_event import TriggerEvent
+from we_condition import TriggerCondition
+from we_action import TriggerAction
+from diagnostics import SEVERITY_WARNING
+
+
+SECTION_CATEGORIES = u'DefaultTriggerCategories'
+SECTION_TRIGGERS = u'DefaultTriggers'
+DEFAULT_TRIGGER_SECTIONS = (SECTION_CATEGORIES, SECTION_TRIGGERS)
+
+_CATEGORY_KEY = re.compile(r'^Category(\d+)$')
+_TRIGGER_KEY = re.compile(r'^Trigger(\d+)([A-Za-z]+)(\d*)$')
+
+# Maps the name used in the keys of each kind of function to the attribute of DefaultTrigger that holds them and to
+# the class of the functions.
+_FUNCTION_KINDS = (
+    ('Event', 'events', TriggerEvent),
+    ('Condition', 'conditions', TriggerCondition),
+    ('Action', 'actions', TriggerAction),
+)
+_FUNCTION_KIND_BY_NAME = {kind[0]: kind for kind in _FUNCTION_KINDS}
+_FUNCTION_KIND_BY_COUNT = {kind[0] + 's': kind for kind in _FUNCTION_KINDS}
+
+
+class DefaultTriggerCategory(object):
+    """A trigger category that is added to new maps. The name is usually a WESTRING."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+
+class DefaultTriggerFunction(object):
+    """An event, condition or action of a DefaultTrigger. Any values after the function name are kept as arguments."""
+    __slots__ = ('function', 'arguments')
+
+    def __init__(self, function, arguments=()):
+        # type: (TriggerEditorObject, list) -> None
+        self.function = function
+        self.arguments = list(arguments)
+
+    def __str__(self):
+        return ','.join([self.function.name] + self.arguments)
+
+
+class DefaultTrigger(object):
+    """
+    A trigger that is added to new maps. The name and comment are usually WESTRINGs. The category is a
+    DefaultTriggerCategory (or None), and events, conditions and actions are lists of DefaultTriggerFunctions.
+    """
+
+    def __init__(self, name, comment=None, category=None, events=None, conditions=None, actions=None):
+        self.name = name
+        self.comment = comment
+        self.category = category  # type: DefaultTriggerCategory
+        self.events = events or []  # type: list[DefaultTriggerFunction]
+        self.conditions = conditions or []  # type: list[DefaultTriggerFunction]
+        self.actions = actions or []  # type: list[DefaultTriggerFunction]
+
+    def __str__(self):
+        return self.name
+
+
+class DefaultTriggerList(object):
+    """The contents of the [DefaultTriggerCategories] and [DefaultTriggers] sections."""
+
+    def __init__(self, categories=None, triggers=None):
+        self.categories = categories or []  # type: list[DefaultTriggerCategory]
+        self.triggers = triggers or []  # type: list[DefaultTrigger]
+
+    @classmethod
+    def from_blocks(cls, blocks, report=None):
+        """
+        Reads the default trigger sections of a BlockParser. Functions are resolved to the TriggerEvents,
+        TriggerConditions and TriggerActions with the same name, so those must already be loaded.
+
+        If a DiagnosticReport is given, problems are recorded in it and the lines that caused them are skipped.
+        Otherwise, a TriggerSyntaxException is raised for the first problem.
+        """
+        result = cls()
+        if SECTION_CATEGORIES in blocks:
+            result._read_categories(_iter_records(blocks, SECTION_CATEGORIES), report)
+        if SECTION_TRIGGERS in blocks:
+            result._read_triggers(_iter_records(blocks, SECTION_TRIGGERS), report)
+        return result
+
+    def _read_categories(self, records, report):
+        declared = declared_line_number = None
+        numbered = {}
+        for line_number, record in records:
+            match = _CATEGORY_KEY.match(record.key)
+            if record.key == 'NumCategories':
+                declared = _read_int(record, line_number, SECTION_CATEGORIES, report)
+                declared_line_number = line_number
+            elif match:
+                numbered[int(match.group(1))] = DefaultTriggerCategory(record.data)
+            else:
+                _problem(report, SECTION_CATEGORIES, line_number, record.key, 'Unrecognized key.')
+
+        self.categories = [numbered[number] for number in sorted(numbered)]
+        _check_count(report, SECTION_CATEGORIES, declared_line_number, 'NumCategories', declared, len(self.categories))
+
+    def _read_triggers(self, records, report):
+        declared = declared_line_number = None
+        fields = {}  # Maps trigger numbers to dicts which map (field, item number) to (line number, record).
+        for line_number, record in records:
+            match = _TRIGGER_KEY.match(record.key)
+            if record.key == 'NumTriggers':
+                declared = _read_int(record, line_number, SECTION_TRIGGERS, report)
+                declared_line_number = line_number
+            elif match:
+                number, field, item = match.groups()
+                fields.setdefault(int(number), {})[(field, int(item) if item else None)] = (line_number, record)
+            else:
+                _problem(report, SECTION_TRIGGERS, line_number, record.key, 'Unrecognized key.')
+
+        self.triggers = []
+        for number in sorted(fields):
+            trigger = self._read_trigger(fields[number], report)
+            if trigger is not None:
+                self.triggers.append(trigger)
+        _check_count(report, SECTION_TRIGGERS, declared_line_number, 'NumTriggers', declared, len(fields))
+
+    def _read_trigger(self, fields, report):
+        if ('Name', None) not in fields:
+            line_number, record = min(fields.itervalues())
+            _problem(report, SECTION_TRIGGERS, line_number, record.key, 'Trigger has no name.')
+            return None
+        trigger = DefaultTrigger(fields[('Name', None)][1].data)
+        counts = {}
+
+        for (field, item), (line_number, record) in sorted(fields.iteritems()):
+            if field == 'Name' and item is None:
+                continue
+            elif field == 'Comment' and item is None:
+                trigger.comment = record.data
+            elif field == 'Category' and item is None:
+                index = _read_int(record, line_number, SECTION_TRIGGERS, report)
+                if index is not None and 0 < index <= len(self.categories):
+                    trigger.category = self.categories[index - 1]
+                elif index is not None:
+                    _problem(report, SECTION_TRIGGERS, line_number, record.key, 'Category %d is not defined.' % index)
+            elif field in _FUNCTION_KIND_BY_COUNT and item is None:
+                counts[field] = (line_number, record.key, _read_int(record, line_number, SECTION_TRIGGERS, report))
+            elif field in _FUNCTION_KIND_BY_NAME and item is not None:
+                _, attribute, class_ = _FUNCTION_KIND_BY_NAME[field]
+                function = _resolve(record, line_number, class_, report)
+                if function is not None:
+                    getattr(trigger, attribute).append(DefaultTriggerFunction(function, record.values[1:]))
+            else:
+                _problem(report, SECTION_TRIGGERS, line_number, record.key, 'Unrecognized key.')
+
+        for field, (line_number, key, declared) in counts.iteritems():
+            numbered = sum(1 for f, item in fields if f == _FUNCTION_KIND_BY_COUNT[field][0] and item is not None)
+            _check_count(report, SECTION_TRIGGERS, line_number, key, declared, numbered)
+        return trigger
+
+    def validate(self, report):
+        """
+        Records in a DiagnosticReport every function that is no longer registered or has the wrong type, and every
+        trigger whose category is not in the list of categories.
+        """
+        for trigger in self.triggers:
+            if trigger.category is not None and trigger.category not in self.categories:
+                report.add(SECTION_TRIGGERS, None, trigger.name,
+                           'Category ' + trigger.category.name + ' is not a default trigger category.')
+            for _, attribute, class_ in _FUNCTION_KINDS:
+                for call in getattr(trigger, attribute):
+                    name = call.function.name
+                    if not call.function.is_registered():
+                        report.add(SECTION_TRIGGERS, None, trigger.name, 'Symbol ' + name + ' is not defined.')
+                    elif not isinstance(call.function, class_):
+                        report.add(SECTION_TRIGGERS, None, trigger.name,
+                                   'Symbol ' + name + ' is not a ' + class_.__name__ + '.')
+
+    def iter_category_lines(self):
+        """Yields the lines of the [DefaultTriggerCategories] section, numbered from 1."""
+        yield 'NumCategories=%d' % len(self.categories)
+        for number, category in enumerate(self.categories, 1):
+            yield 'Category%02d=%s' % (number, category.name)
+
+    def iter_trigger_lines(self):
+        """Yields the lines of the [DefaultTriggers] section, numbered from 1. Triggers are separated by empty lines."""
+        yield 'NumTriggers=%d' % len(self.triggers)
+        for number, trigger in enumerate(self.triggers, 1):
+            prefix = 'Trigger%02d' % number
+            yield ''
+            yield '%sName=%s' % (prefix, trigger.name)
+            if trigger.comment is not None:
+                yield '%sComment=%s' % (prefix, trigger.comment)
+            if trigger.category is not None:
+                yield '%sCategory=%d' % (prefix, self.categories.index(trigger.category) + 1)
+            for kind, attribute, _ in _FUNCTION_KINDS:
+                calls = getattr(trigger, attribute)
+                yield '%s%ss=%d' % (prefix, kind, len(calls))
+                for item, call in enumerate(calls, 1):
+                    yield '%s%s%02d=%s' % (prefix, kind, item, call)
+
+    def convert_to_block(self, section):
+        # type: (str) -> str
+        """Returns the contents of one of the two sections (without the section header)."""
+        if section == SECTION_CATEGORIES:
+            return '\n'.join(self.iter_category_lines())
+        elif section == SECTION_TRIGGERS:
+            return '\n'.join(self.iter_trigger_lines())
+        raise TriggerSyntaxException("This trigger editor class is not recognized.")
+
+
+# ======================================================================================================================
+# Utilities
+# ======================================================================================================================
+
+def _iter_records(blocks, section):
+    """Yields a (line number, LineRecord) tuple for each line of a section. Unknown line numbers are None."""
+    line_numbers = blocks.line_numbers(section)
+    for index, block in enumerate(blocks[section]):
+        for line in block:
+            yield line_numbers[index], as_record(line)
+
+
+def _problem(report, section, line_number, symbol, message):
+    if report is None:
+        raise TriggerSyntaxException(symbol + ': ' + message)
+    report.add(section, line_number, symbol, message)
+
+
+def _read_int(record, line_number, section, report):
+    try:
+        return int(record.data)
+    except ValueError:
+        _problem(report, section, line_number, record.key, record.data + ' is not a number.')
+        return None
+
+
+def _check_count(report, section, line_number, key, declared, actual):
+    """Counts that do not match are only warnings, because the numbers are generated again when writing."""
+    if declared is not None and declared != actual and report is not None:
+        report.add(section, line_number, key, 'Declares %d entries, but %d were found.' % (declared, actual),
+                   SEVERITY_WARNING)
+
+
+def _resolve(record, line_number, class_, report):
+    name = record.values[0]
+    function = class_._instances.get(name)
+    if function is not None:
+        return function
+    if TriggerEditorObject.find_object(name) is None:
+        _problem(report, SECTION_TRIGGERS, line_number, record.key, 'Symbol ' + name + ' is not defined.')
+    else:
+        _problem(report, SECTION_TRIGGERS, line_number, record.key,
+                 'Symbol ' + name + ' is not a ' + class_.__name__ + '.')
+    return None
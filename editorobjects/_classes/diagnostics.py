@@ -0,0 +1,55 @@
+from collections import namedtuple
+
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+
+Diagnostic = namedtuple('Diagnostic', ['section', 'line_number', 'symbol', 'message', 'severity'])
+"""
+A problem found while loading a file. Any field except message and severity may be None if it is not known.
+"""
+
+
+class DiagnosticReport(object):
+    """
+    Collects Diagnostics instead of raising or printing them, so that loading can continue past any number of bad
+    blocks and the problems can be inspected or printed together afterwards.
+    """
+
+    def __init__(self, file_name=None):
+        self.file_name = file_name
+        self._diagnostics = []
+
+    def add(self, section, line_number, symbol, message, severity=SEVERITY_ERROR):
+        self._diagnostics.append(Diagnostic(section, line_number, symbol, message, severity))
+
+    def __iter__(self):
+        return iter(self._diagnostics)
+
+    def __len__(self):
+        return len(self._diagnostics)
+
+    @property
+    def errors(self):
+        # type: () -> list[Diagnostic]
+        return [diagnostic for diagnostic in self._diagnostics if diagnostic.severity == SEVERITY_ERROR]
+
+    @property
+    def warnings(self):
+        # type: () -> list[Diagnostic]
+        return [diagnostic for diagnostic in self._diagnostics if diagnostic.severity == SEVERITY_WARNING]
+
+    def format_diagnostic(self, diagnostic):
+        # type: (Diagnostic) -> str
+        """Formats a Diagnostic as 'file:line: severity: [section] symbol: message'."""
+        location = ':'.join(str(x) for x in (self.file_name, diagnostic.line_number) if x is not None)
+        context = ' '.join(x for x in ('[' + diagnostic.section + ']' if diagnostic.section else None,
+                                       diagnostic.symbol) if x)
+        return '%s%s: %s%s' % (location + ': ' if location else '',
+                               diagnostic.severity,
+                               context + ': ' if context else '',
+                               diagnostic.message)
+
+    def __str__(self):
+        return '\n'.join(self.format_diagnostic(diagnostic) for diagnostic in self._diagnostics)
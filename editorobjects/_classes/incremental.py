@@ -0,0 +1,128 @@
+from collections import OrderedDict, namedtuple
+import hashlib
+
+from my_exceptions import TriggerObjectInUseException
+from block_parser import TriggerEditorObjectParser, INVALID_BLOCK_ERRORS
+from utilities import as_record
+
+
+ReloadSummary = namedtuple('ReloadSummary', ['added', 'updated', 'removed', 'errors'])
+"""
+The changes made by IncrementalLoader.load.
+
+added:   List of objects created from blocks that did not exist in the previous load.
+updated: List of objects whose blocks changed. They keep their identity.
+removed: List of objects whose blocks no longer exist.
+errors:  List of (section, block, exception) tuples for blocks that could not be parsed. New blocks with errors are
+         skipped. Changed blocks with errors leave their objects as they were. Objects whose blocks were removed, but
+         which are still referenced by other objects, are kept and reported with a None block and the
+         TriggerObjectInUseException.
+"""
+
+
+def hash_block(block):
+    # type: (list) -> str
+    return hashlib.sha1(u'\n'.join(block).encode('utf-8')).digest()
+
+
+class IncrementalLoader(object):
+    """
+    Loads the blocks of a BlockParser into TriggerEditorObjects and remembers a hash of the block each object was
+    created from. When a new version of the same file is loaded, only the objects whose blocks were removed, added or
+    changed are touched. Objects whose blocks did not change keep their identity and registration.
+
+    Objects are identified by section and key (the text before the equals sign in the declaration line).
+    """
+
+    def __init__(self):
+        # Maps section names to lists of (key, digest, object) tuples, in file order.
+        self._loaded = OrderedDict()  # type: OrderedDict[str, list[tuple[str, str, TriggerEditorObject]]]
+
+    @property
+    def data(self):
+        """An OrderedDict which maps section names to OrderedDicts of objects by name, like main.load_data."""
+        result = OrderedDict()
+        for section in self._loaded:
+            result[section] = OrderedDict((obj.name, obj) for _, _, obj in self._loaded[section])
+        return result
+
+    def load(self, blocks):
+        """
+        Loads a BlockParser. The first call creates every object. Later calls only apply the differences from the
+        previous call.
+
+        Removals are applied first, in reverse section order, so functions are removed before the categories they
+        reference. Then updates and additions are applied in section order. Objects that are still referenced once
+        every change has been applied are not removed: they stay loaded, so a later load can remove them, and they are
+        reported in ReloadSummary.errors.
+
+        :rtype: ReloadSummary
+        """
+        summary = ReloadSummary([], [], [], [])
+
+        new_sections = OrderedDict()
+        for section in blocks:
+            if TriggerEditorObjectParser.supports(section):
+                new_sections[section] = [(as_record(block[0]).key, hash_block(block), block)
+                                         for block in blocks[section]]
+
+        removals = OrderedDict()  # Maps the objects to remove to the (section, key, digest) they were loaded with.
+        for section in reversed(self._loaded.keys()):
+            new_keys = set(key for key, _, _ in new_sections.get(section, ()))
+            for key, digest, obj in self._loaded[section]:
+                if key not in new_keys:
+                    removals[obj] = (section, key, digest)
+            if section not in new_sections:
+                del self._loaded[section]
+
+        # Objects which are still referenced may stop being referenced once the changed blocks are applied.
+        in_use = self._remove(removals, summary)
+
+        for section, new_blocks in new_sections.iteritems():
+            parser = TriggerEditorObjectParser(section)
+            old = dict((key, (digest, obj)) for key, digest, obj in self._loaded.get(section, ()))
+            loaded = []
+
+            for key, digest, block in new_blocks:
+                previous = old.get(key)
+                if previous and previous[0] == digest:
+                    loaded.append((key, digest, previous[1]))
+                    continue
+                try:
+                    if previous:
+                        parser.update_object(previous[1], block)
+                        summary.updated.append(previous[1])
+                        loaded.append((key, digest, previous[1]))
+                    else:
+                        obj = parser.parse_block_to_object(block)
+                        summary.added.append(obj)
+                        loaded.append((key, digest, obj))
+                except INVALID_BLOCK_ERRORS as error:
+                    summary.errors.append((section, block, error))
+                    if previous:
+                        loaded.append((key, previous[0], previous[1]))
+
+            self._loaded[section] = loaded
+
+        for obj, error in self._remove([obj for obj, _ in in_use], summary):
+            section, key, digest = removals[obj]
+            self._loaded.setdefault(section, []).append((key, digest, obj))
+            summary.errors.append((section, None, error))
+
+        return summary
+
+    @staticmethod
+    def _remove(objects, summary):
+        """
+        Removes objects, returning (object, exception) tuples for those that could not be removed because they are
+        referenced.
+        """
+        in_use = []
+        for obj in objects:
+            try:
+                obj.remove()
+            except TriggerObjectInUseException as error:
+                in_use.append((obj, error))
+            else:
+                summary.removed.append(obj)
+        return in_use
@@ -0,0 +1,125 @@
+"""
+This module finds the TriggerEditorObjects that are used by the GUI triggers of a map, by reading its war3map.wtg file
+(see editorfiles.wtg) and resolving every function, preset and variable type against the loaded objects.
+
+The usage of several maps can be combined with MapUsage.update, to find the objects of a package that no map uses.
+"""
+from editorfiles.wtg import WtgReader, UndefinedFunctionError, FUNCTION_EVENT, FUNCTION_CONDITION, FUNCTION_ACTION, \
+    FUNCTION_CALL, PARAMETER_PRESET
+from we_event import TriggerEvent
+from we_condition import TriggerCondition
+from we_action import TriggerAction
+from we_call import TriggerCall
+from we_param import TriggerParam
+from we_type import TriggerType
+from workspace import Workspace
+
+
+# Maps the kinds of functions of war3map.wtg files to the classes of the functions.
+FUNCTION_CLASSES = {
+    FUNCTION_EVENT:     TriggerEvent,
+    FUNCTION_CONDITION: TriggerCondition,
+    FUNCTION_ACTION:    TriggerAction,
+    FUNCTION_CALL:      TriggerCall,
+}
+
+
+# noinspection PyProtectedMember
+def get_argument_count(kind, name, workspace=None):
+    # type: (int, str, Workspace) -> int
+    """
+    Returns the number of arguments of a function registered in a workspace (by default, the active workspace), or
+    None if it is not registered (see WtgReader).
+    """
+    class_ = FUNCTION_CLASSES.get(kind)
+    function_ = class_.get_namespace(class_._SECTION, workspace).get(name) if class_ is not None else None
+    if function_ is None:
+        return None
+    return sum(1 for argument_type in function_.argument_types if argument_type != 'nothing')
+
+
+class MapUsage(object):
+    """
+    The TriggerEditorObjects used by the triggers of one or more maps.
+
+    functions: The set of TriggerEditorFunctions that are used.
+    presets:   The set of TriggerParams that are used as preset parameters.
+    types:     The set of TriggerTypes of the global variables.
+    unknown:   The set of (section, name) tuples of the references that are not defined.
+    """
+
+    def __init__(self):
+        self.functions = set()
+        self.presets = set()  # type: set[TriggerParam]
+        self.types = set()  # type: set[TriggerType]
+        self.unknown = set()  # type: set[tuple[str, str]]
+
+    def is_used(self, obj):
+        # type: (TriggerEditorObject) -> bool
+        return obj in self.functions or obj in self.presets or obj in self.types
+
+    def update(self, other):
+        # type: (MapUsage) -> None
+        """Adds the usage of another MapUsage to this one."""
+        self.functions |= other.functions
+        self.presets |= other.presets
+        self.types |= other.types
+        self.unknown |= other.unknown
+
+
+# noinspection PyProtectedMember
+def read_map_usage(path, report=None, workspace=None):
+    # type: (str, DiagnosticReport, Workspace) -> MapUsage
+    """
+    Reads a war3map.wtg file and returns the objects used by its triggers. The file is streamed, one trigger at a time.
+    References are resolved against the objects of a workspace (by default, the active workspace).
+
+    Presets and variable types that are not defined are added to MapUsage.unknown and recorded in the DiagnosticReport,
+    if one is given. A function that is not defined stops the reading, because the number of its parameters is not
+    known. In that case, it is recorded in the DiagnosticReport and the usage of the triggers read before it is
+    returned. If no report is given, an UndefinedFunctionError is raised instead.
+    """
+    if workspace is None:
+        workspace = Workspace.get_active()
+    usage = MapUsage()
+    with open(path, 'rb') as f:
+        reader = WtgReader(f, lambda kind, name: get_argument_count(kind, name, workspace))
+        for variable in reader.variables:
+            _use(usage, report, workspace, TriggerType, variable.type, 'variable ' + variable.name)
+        try:
+            for trigger in reader:
+                for function_ in trigger.functions:
+                    _use_function(usage, report, workspace, function_, trigger.name)
+        except UndefinedFunctionError as error:
+            class_ = FUNCTION_CLASSES.get(error.kind)
+            section = class_._SECTION if class_ is not None else None
+            usage.unknown.add((section, error.name))
+            if report is None:
+                raise
+            report.add(section, None, error.name, error.message + ' The rest of the file was not read.')
+    return usage
+
+
+# noinspection PyProtectedMember
+def _use(usage, report, workspace, class_, name, user):
+    obj = workspace.get_namespace(class_._SECTION).get(name)
+    if obj is not None:
+        (usage.types if class_ is TriggerType else usage.presets).add(obj)
+    elif (class_._SECTION, name) not in usage.unknown:
+        usage.unknown.add((class_._SECTION, name))
+        if report is not None:
+            report.add(class_._SECTION, None, name, 'Used by ' + user + ', but not defined.')
+
+
+# noinspection PyProtectedMember
+def _use_function(usage, report, workspace, function_, trigger_name):
+    usage.functions.add(workspace.get_namespace(FUNCTION_CLASSES[function_.kind]._SECTION)[function_.name])
+    for parameter in function_.parameters:
+        while parameter is not None:
+            if parameter.kind == PARAMETER_PRESET:
+                _use(usage, report, workspace, TriggerParam, parameter.value, 'trigger ' + trigger_name)
+            if parameter.call is not None:
+                _use_function(usage, report, workspace, parameter.call, trigger_name)
+            parameter = parameter.index
+    for child in function_.children:
+        _use_function(usage, report, workspace, child, trigger_name)
@@ -0,0 +1,84 @@
+"""
+This module implements a persistent cache of parsed TriggerData files.
+
+The cache file is stored next to the source file (with the CACHE_EXTENSION appended to its name) and contains the
+results of TriggerEditorObjectParser.parse_block_to_kwargs (or of parse_block_to_row, for trusted files) for every
+block, keyed by a hash of the source file's contents and by PARSER_VERSION. Rebuilding objects from the cache skips
+reading, tokenizing and parsing the file, but the objects still have to be created and registered (see benchmark.py
+for the difference).
+
+The cache file is read and written with load_cache and store_cache (see editorfiles.cache).
+"""
+from collections import OrderedDict
+import hashlib
+
+from my_collections import BlockParser
+from editorfiles.mapped import MappedTriggerData
+from editorfiles.cache import load_cache, store_cache
+from block_parser import TriggerEditorObjectParser, parse_blocks
+
+
+# Must be incremented whenever a change to the lexer or to any parse_from_text or parse_row method changes the parsed
+# output, and whenever the meaning of the cached results changes (for example, how block parameters are stored or
+# converted).
+PARSER_VERSION = 9
+
+CACHE_EXTENSION = '.tdcache'
+
+
+def file_digest(path):
+    # type: (str) -> str
+    """
+    Returns the SHA-1 digest of the contents of a file, with CRLF line breaks replaced by LF. Files that only differ in
+    their line breaks are parsed the same, so they share a digest. The digest also identifies trusted files (see
+    is_trusted_file).
+    """
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read().replace('\r\n', '\n')).hexdigest()
+
+
+def read_cache(path, digest, trusted=False):
+    """
+    Returns the parsed sections stored in the cache file of path, or None if there is no cache file, if it is stale or
+    unreadable, or if it was not written in the same mode (trusted or not, see parse_blocks).
+    """
+    cached = load_cache(path + CACHE_EXTENSION, PARSER_VERSION, digest)
+    if cached is None:
+        return None
+    cached_trusted, sections = cached
+    if cached_trusted != trusted:
+        return None
+    return sections
+
+
+def write_cache(path, digest, sections, trusted=False):
+    """Writes the cache file of path. Failing to write the cache (for example, in a read-only folder) is ignored."""
+    store_cache(path + CACHE_EXTENSION, PARSER_VERSION, digest, (trusted, sections))
+
+
+def load_parsed_sections(path, encoding=None, trusted=False, digest=None):
+    """
+    Returns an OrderedDict which maps the recognized sections of a file to the results of parse_blocks for their
+    blocks. The results are read from the cache file when it is up to date. Otherwise, the file is parsed and the cache
+    file is written, unless some block could not be parsed.
+
+    Use TriggerEditorObjectParser.build_object to create objects from the results, or build_trusted_objects if trusted
+    is True.
+
+    :param digest: The file_digest of the file, if it is already known.
+    """
+    if digest is None:
+        digest = file_digest(path)
+    sections = read_cache(path, digest, trusted)
+    if sections is not None:
+        return sections
+
+    sections = OrderedDict()
+    with BlockParser(MappedTriggerData(path, encoding)) as blocks:
+        for section in blocks:
+            if TriggerEditorObjectParser.supports(section):
+                sections[section] = parse_blocks(section, blocks[section], trusted)
+
+    if not any(isinstance(parsed, Exception) for results in sections.itervalues() for parsed in results):
+        write_cache(path, digest, sections, trusted)
+    return sections
@@ -0,0 +1,101 @@
+"""
+This module checks the TriggerEditorFunctions against the declarations of the JASS files that implement them (see
+editorfiles.JassIndex).
+
+Every function must name a declared script function: its ScriptName block parameter if it has one, or its own name
+otherwise. The number of arguments must match, and arguments whose types are known script types must be assignable
+to the script function's parameter types. Arguments of type code are ignored when the counts do not match, because
+the editor creates those functions itself (for example, for the actions of EnumDestructablesInRectAllMultiple).
+"""
+from we_type import TriggerType
+from we_function import iter_all_functions
+from we_event import TriggerEvent
+from we_call import TriggerCall
+from block_parser import TriggerEditorObjectParser
+from diagnostics import SEVERITY_WARNING
+
+
+# Functions which are specially handled by the editor, instead of calling a script function with the same name. All
+# functions whose names start with Operator are also handled by the editor.
+EDITOR_FUNCTIONS = frozenset([
+    'MapInitializationEvent',
+    'AndMultiple', 'OrMultiple',
+    'CommentString', 'CustomScriptCode', 'SetVariable', 'ReturnAction',
+    'IfThenElseMultiple', 'IfThenElse',
+    'ForLoopAMultiple', 'ForLoopBMultiple', 'ForLoopVarMultiple', 'ForLoopA', 'ForLoopB', 'ForLoopVar',
+])
+
+
+def get_script_name(function_):
+    # type: (TriggerEditorFunction) -> str
+    """Returns the name of the script function called by a TriggerEditorFunction."""
+    if function_.supports('ScriptName') and function_.block_params['ScriptName'] is not None:
+        return str(function_.block_params['ScriptName'])
+    return function_.name
+
+
+def get_script_type(type_name, workspace=None):
+    # type: (str, Workspace) -> str
+    """
+    Returns the script type of a TriggerType: its base type for custom types, otherwise its own name. The type is looked
+    up in a workspace (by default, the active workspace).
+    """
+    trigger_type = TriggerType.get_namespace(u'TriggerTypes', workspace).get(type_name)
+    if trigger_type is not None and getattr(trigger_type, 'base_type', None):
+        return trigger_type.base_type
+    return type_name
+
+
+# noinspection PyProtectedMember
+def check_script_functions(index, report, functions=None, ignore=EDITOR_FUNCTIONS, workspace=None):
+    """
+    Checks TriggerEditorFunctions against a JassIndex and records every problem in a DiagnosticReport. Script
+    functions that are not declared and argument counts that do not match are errors. Type mismatches are warnings.
+
+    :param index: A JassIndex, usually of common.j and Blizzard.j.
+    :param report: The DiagnosticReport where problems are recorded.
+    :param functions: The functions to check. By default, all registered functions of the workspace are checked.
+    :param ignore: Names of functions that are handled by the editor and are not checked, unless they have a
+    ScriptName.
+    :param workspace: The workspace whose functions are checked when functions is None. By default, the active
+    workspace. The argument types of each function are looked up in the workspace of the function.
+    """
+    sections = {class_: section for section, class_ in TriggerEditorObjectParser._DICT_STR2CLASS.iteritems()}
+    if functions is None:
+        order = {section: position for position, section in enumerate(TriggerEditorObjectParser._DICT_STR2CLASS)}
+        functions = sorted(iter_all_functions(workspace), key=lambda x: (order.get(sections.get(type(x))), x.name))
+
+    for function_ in functions:
+        section = sections.get(type(function_))
+        script_name = get_script_name(function_)
+        if script_name == function_.name and (script_name in ignore or script_name.startswith('Operator')):
+            continue
+
+        declaration = index.get(script_name)
+        if declaration is None:
+            report.add(section, None, function_.name, 'Script function ' + script_name + ' is not declared.')
+            continue
+
+        if isinstance(function_, TriggerEvent):
+            argument_types = function_.script_argument_types
+        else:
+            argument_types = [arg for arg in function_.argument_types if arg != 'nothing']
+        parameter_types = declaration.argument_types
+        if len(argument_types) != len(parameter_types):
+            parameter_types = tuple(parameter for parameter in parameter_types if parameter != 'code')
+        if len(argument_types) != len(parameter_types):
+            report.add(section, None, function_.name, 'Takes %d arguments, but script function %s takes %d.'
+                       % (len(argument_types), script_name, len(declaration.argument_types)))
+            continue
+
+        for position, (argument_type, parameter_type) in enumerate(zip(argument_types, parameter_types), 1):
+            script_type = get_script_type(argument_type, function_._workspace)
+            if index.is_type(script_type) and not index.is_assignable(script_type, parameter_type):
+                report.add(section, None, function_.name, 'Argument %d is a %s, but script function %s takes a %s.'
+                           % (position, script_type, script_name, parameter_type), SEVERITY_WARNING)
+
+        if isinstance(function_, TriggerCall):
+            script_type = get_script_type(function_.return_type, function_._workspace)
+            if index.is_type(script_type) and not index.is_assignable(declaration.return_type, script_type):
+                report.add(section, None, function_.name, 'Returns a %s, but script function %s returns a %s.'
+                           % (script_type, script_name, declaration.return_type), SEVERITY_WARNING)
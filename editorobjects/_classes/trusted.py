@@ -0,0 +1,34 @@
+"""
+This module keeps track of TriggerData files that are known to be valid, such as the unmodified TriggerData.txt
+distributed with the game. Files are identified by the hash of their contents (see file_digest), so a modified copy is
+never trusted. Line breaks are normalized before hashing, so a file is trusted whether it uses CRLF (as distributed
+with the game) or LF line breaks (for example, when checked out by git with core.autocrlf).
+
+The objects of a trusted file are created from tuples with TriggerEditorObjectParser.build_trusted_objects, which
+skips the checks that are only needed to report problems in user files.
+"""
+from parse_cache import file_digest
+
+
+# The digests of the base files that are trusted by default (see file_digest).
+TRUSTED_DIGESTS = {
+    'b5031586f4809114cff1ba021937fc8f757b715d',  # TriggerData.txt
+}
+
+
+def trust_file(path):
+    # type: (str) -> str
+    """Marks the current contents of a file as trusted and returns their digest."""
+    digest = file_digest(path)
+    TRUSTED_DIGESTS.add(digest)
+    return digest
+
+
+def is_trusted_file(path, digest=None):
+    # type: (str, str) -> bool
+    """
+    Returns whether the contents of a file are trusted.
+
+    :param digest: The file_digest of the file, if it is already known.
+    """
+    return (digest if digest is not None else file_digest(path)) in TRUSTED_DIGESTS
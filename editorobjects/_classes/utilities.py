@@ -1,11 +1,30 @@
-def get_line_data(line):
-    return (line[line.find('=') + 1:].strip()).replace(' ', '')
+from editorfiles.lexer import LineRecord, parse_line
 
 
-def get_line_key(line):
-    return (line[:line.find('=')].strip()).replace(' ', '')
+# The last (line, LineRecord) pair returned by as_record. parse_from_text methods call their superclass's method, so
+# the declaration line of a block is usually looked up several times in a row.
+_last_record = (None, None)
 
 
-def get_line_param(line):
-    line = line[line.find('_') + 1:]
-    return line[line.find('_') + 1:line.find('=')].strip()
+def as_record(line):
+    # type: (unicode) -> LineRecord
+    """
+    Returns the fields of a line as a LineRecord. A line that is looked up again right after it was returned (the same
+    string object) is not split again.
+    """
+    global _last_record
+    last_line, record = _last_record
+    if last_line is not line:
+        record = parse_line(line)
+        _last_record = (line, record)
+    return record
+
+
+def is_integer(value):
+    # type: (str) -> bool
+    """Returns whether int() can convert a value."""
+    try:
+        int(value)
+    except (ValueError, TypeError):
+        return False
+    return True
@@ -1,6 +1,7 @@
 # Find [TriggerCalls] line and place these actions above it
-from utilities import get_line_data
+from utilities import as_record
 from we_function import TriggerEditorFunction
+from blockparameters import BLOCK_PARAMETER_SCHEMAS
 
 
 class TriggerAction(TriggerEditorFunction):
@@ -12,6 +13,9 @@ class TriggerAction(TriggerEditorFunction):
         Value 1+: argument types
     """
 
+    _SECTION = u'TriggerActions'
+    _BLOCK_PARAMETERS = BLOCK_PARAMETER_SCHEMAS[_SECTION]
+
     def __init__(self, **kwargs):
         super(TriggerAction, self).__init__(**kwargs)
 
@@ -22,13 +26,24 @@ class TriggerAction(TriggerEditorFunction):
         # type: (list) -> dict
         kwargs = super(TriggerAction, TriggerAction).parse_from_text(block)
 
-        declaration = get_line_data(block[0]).split(',')
+        declaration = as_record(block[0]).values
 
         kwargs['minimum_version'] = int(declaration[0])
         kwargs['argument_types'] = declaration[1:]
 
         return kwargs
 
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        return record.key, int(declaration[0]), declaration[1:], cls._parse_row_block_params(block)
+
+    def _set_row(self, row):
+        name, self.minimum_version, argument_types, block_params = row
+        self._set_function_row(name, argument_types, block_params)
+
     def params(self):
         yield self.minimum_version
         for argtype in self.argument_types:
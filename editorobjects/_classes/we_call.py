@@ -1,5 +1,6 @@
-from utilities import get_line_data
-from we_function import TriggerEditorFunction, BLOCK_PARAMETERS_NO_SCRIPTNAME
+from utilities import as_record
+from we_function import TriggerEditorFunction
+from blockparameters import BLOCK_PARAMETER_SCHEMAS
 
 
 class TriggerCall(TriggerEditorFunction):
@@ -15,7 +16,8 @@ class TriggerCall(TriggerEditorFunction):
     Note: Operators are specially handled by the editor
     """
 
-    _VALID_BLOCK_PARAMETERS = BLOCK_PARAMETERS_NO_SCRIPTNAME
+    _SECTION = u'TriggerCalls'
+    _BLOCK_PARAMETERS = BLOCK_PARAMETER_SCHEMAS[_SECTION]
 
     def __init__(self, **kwargs):
         super(TriggerCall, self).__init__(**kwargs)
@@ -29,7 +31,7 @@ class TriggerCall(TriggerEditorFunction):
         # type: (list) -> dict
         kwargs = super(TriggerCall, TriggerCall).parse_from_text(block)
 
-        declaration = get_line_data(block[0]).split(',')
+        declaration = as_record(block[0]).values
 
         kwargs['minimum_version'] = int(declaration[0])
         kwargs['events_flag'] = int(declaration[1])
@@ -38,6 +40,18 @@ class TriggerCall(TriggerEditorFunction):
 
         return kwargs
 
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        return (record.key, int(declaration[0]), int(declaration[1]), declaration[2], declaration[3:],
+                cls._parse_row_block_params(block))
+
+    def _set_row(self, row):
+        name, self.minimum_version, self.events_flag, self.return_type, argument_types, block_params = row
+        self._set_function_row(name, argument_types, block_params)
+
     def params(self):
         yield self.minimum_version
         yield self.events_flag
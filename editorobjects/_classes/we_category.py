@@ -1,9 +1,9 @@
 from my_exceptions import TriggerObjectInUseException
 
-from utilities import get_line_data
+from utilities import as_record
 from we_object import TriggerEditorObject
 from we_referable import TriggerEditorReferable
-from we_function import iter_all_functions
+from we_function import TriggerEditorFunction
 
 
 class TriggerCategory(TriggerEditorObject, TriggerEditorReferable):
@@ -16,10 +16,13 @@ class TriggerCategory(TriggerEditorObject, TriggerEditorReferable):
         Value 2: Optional flag (defaults to 0) indicating to disable display of category name
     """
 
+    _SECTION = u'TriggerCategories'
+
     def params(self):
         yield self.display_text
         yield self.icon
-        yield self.disable_display
+        if self.disable_display:  # Optional, and 0 when it is not declared.
+            yield self.disable_display
 
     def __init__(self, **kwargs):
         super(TriggerCategory, self).__init__(**kwargs)
@@ -29,18 +32,13 @@ class TriggerCategory(TriggerEditorObject, TriggerEditorReferable):
         self.disable_display = kwargs['disable_display'] if 'disable_display' in kwargs else 0
 
     def is_referenced(self):
-        for function_ in iter_all_functions():
-            if function_.block_params['Category'] == self:
-                return True
-        return False
+        return TriggerEditorFunction.has_category_references(self.name, self._workspace)
 
     def get_references(self):
-        result = set()
+        return TriggerEditorFunction.get_category_references(self.name, self._workspace)
 
-        for function_ in iter_all_functions():
-            if function_.block_params['Category'] == self:
-                result.add(function_)
-        return result
+    def _renamed(self, old_name):
+        TriggerEditorFunction.rename_category_references(old_name, self._name, self._workspace)
 
     def remove(self):
         used_in = self.get_references()
@@ -53,10 +51,20 @@ class TriggerCategory(TriggerEditorObject, TriggerEditorReferable):
         # type: (list) -> dict
         kwargs = super(TriggerCategory, TriggerCategory).parse_from_text(block)
 
-        params = get_line_data(block[0]).split(',')
+        params = as_record(block[0]).values
 
         kwargs['display_text'] = params[0]
         kwargs['icon'] = params[1]
         kwargs['disable_display'] = int(params[2]) if len(params) > 2 else 0
 
         return kwargs
+
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        params = record.values
+        return record.key, params[0], params[1], int(params[2]) if len(params) > 2 else 0
+
+    def _set_row(self, row):
+        self._name, self.display_text, self.icon, self.disable_display = row
@@ -1,5 +1,6 @@
-from utilities import get_line_data
-from we_function import BLOCK_PARAMETERS_NO_SCRIPTNAME, TriggerEditorFunction
+from utilities import as_record
+from we_function import TriggerEditorFunction
+from blockparameters import BLOCK_PARAMETER_SCHEMAS
 
 
 class TriggerCondition(TriggerEditorFunction):
@@ -11,7 +12,8 @@ class TriggerCondition(TriggerEditorFunction):
     // Value 1+: argument types
     """
 
-    _VALID_BLOCK_PARAMETERS = BLOCK_PARAMETERS_NO_SCRIPTNAME
+    _SECTION = u'TriggerConditions'
+    _BLOCK_PARAMETERS = BLOCK_PARAMETER_SCHEMAS[_SECTION]
 
     def __init__(self, **kwargs):
         super(TriggerCondition, self).__init__(**kwargs)
@@ -23,13 +25,24 @@ class TriggerCondition(TriggerEditorFunction):
         # type: (list) -> dict
         kwargs = super(TriggerCondition, TriggerCondition).parse_from_text(block)
 
-        declaration = get_line_data(block[0]).split(',')
+        declaration = as_record(block[0]).values
 
         kwargs['minimum_version'] = int(declaration[0])
         kwargs['argument_types'] = declaration[1:]
 
         return kwargs
 
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        return record.key, int(declaration[0]), declaration[1:], cls._parse_row_block_params(block)
+
+    def _set_row(self, row):
+        name, self.minimum_version, argument_types, block_params = row
+        self._set_function_row(name, argument_types, block_params)
+
     def __repr__(self):
         return """TriggerCondition(%s)
         MinVersion: %d
@@ -0,0 +1,62 @@
+from utilities import as_record
+from we_function import TriggerEditorFunction
+from blockparameters import BLOCK_PARAMETER_SCHEMAS
+
+
+# Every event function takes the trigger that is registered to the event as its first argument. It is not declared in
+# TriggerData.txt.
+IMPLICIT_ARGUMENT_TYPE = 'trigger'
+
+
+class TriggerEvent(TriggerEditorFunction):
+    """
+    [TriggerEvents]
+        Defines events available in the editor
+        Key: script event function
+        Value 0: first game version in which this function is valid
+        Value 1+: argument types
+
+    Note: The first argument is always a `trigger`, and is excluded from argument_types (see script_argument_types).
+    """
+
+    _SECTION = u'TriggerEvents'
+    _BLOCK_PARAMETERS = BLOCK_PARAMETER_SCHEMAS[_SECTION]
+
+    def __init__(self, **kwargs):
+        super(TriggerEvent, self).__init__(**kwargs)
+
+        self.minimum_version = kwargs['minimum_version']
+
+    @staticmethod
+    def parse_from_text(block):
+        # type: (list) -> dict
+        kwargs = super(TriggerEvent, TriggerEvent).parse_from_text(block)
+
+        declaration = as_record(block[0]).values
+
+        kwargs['minimum_version'] = int(declaration[0])
+        kwargs['argument_types'] = declaration[1:]
+
+        return kwargs
+
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        return record.key, int(declaration[0]), declaration[1:], cls._parse_row_block_params(block)
+
+    def _set_row(self, row):
+        name, self.minimum_version, argument_types, block_params = row
+        self._set_function_row(name, argument_types, block_params)
+
+    @property
+    def script_argument_types(self):
+        # type: () -> list
+        """The argument types of the script function, including the implicit trigger argument."""
+        return [IMPLICIT_ARGUMENT_TYPE] + [arg for arg in self.argument_types if arg != 'nothing']
+
+    def params(self):
+        yield self.minimum_version
+        for argtype in self.argument_types:
+            yield argtype
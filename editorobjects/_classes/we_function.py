@@ -2,14 +2,17 @@ from collections import Iterator
 import abc
 
 
-from utilities import get_line_param, get_line_data
-from my_collections import ValidatedDict
+from utilities import as_record
 from we_object import TriggerEditorObject
-from blockparameters import parse_block_parameter
+from workspace import WorkspaceAttribute, Workspace
+from blockparameters import BlockParameterSchema, BlockParameterDict, ParamDefaults, ParamLimits, ParamCategory
+from diagnostics import SEVERITY_ERROR, SEVERITY_WARNING
+from my_exceptions import TriggerSyntaxException
 
 
-BLOCK_PARAMETERS_ALL = {'Defaults', 'Limits', 'Category', 'ScriptName'}
-BLOCK_PARAMETERS_NO_SCRIPTNAME = BLOCK_PARAMETERS_ALL - {'ScriptName'}
+# Map the names of categories and types to the sets of functions that reference them, in each workspace.
+_CATEGORY_REFERENCES = WorkspaceAttribute(dict)
+_TYPE_REFERENCES = WorkspaceAttribute(dict)
 
 
 class TriggerEditorFunction(TriggerEditorObject):
@@ -18,30 +21,169 @@ class TriggerEditorFunction(TriggerEditorObject):
     declared in a single line, but also have blocks which are lines preceded by an underscore below it. A block ends on
     the next line that does not start in an underscore.
 
-    Block parameters are represented by the classes in the blockparameters module.
+    Block parameters are represented by the classes in the blockparameters module. The block parameters that are valid
+    for each subclass, and how they are parsed, are defined by its section's schema (see BLOCK_PARAMETER_SCHEMAS).
+
+    Registered functions are indexed by the name of their category and by the names of their argument types, so the
+    references to a TriggerCategory or TriggerType can be found without scanning every function. The indexes are
+    updated when the Category block parameter or the argument types of a function are changed.
     """
-    _VALID_BLOCK_PARAMETERS = BLOCK_PARAMETERS_ALL
+    _BLOCK_PARAMETERS = BlockParameterSchema({
+        'Defaults': ParamDefaults,
+        'Limits': ParamLimits,
+        'Category': ParamCategory,
+        'ScriptName': str,
+    })
 
     __metaclass__ = abc.ABCMeta
 
+    _category_references = _CATEGORY_REFERENCES  # type: dict[str, set[TriggerEditorFunction]]
+    _type_references = _TYPE_REFERENCES  # type: dict[str, set[TriggerEditorFunction]]
+
     def __init__(self, **kwargs):
-        self.block_params = ValidatedDict(self._VALID_BLOCK_PARAMETERS)
-        for param in self._VALID_BLOCK_PARAMETERS:
-            if param in kwargs:
-                self.block_params[param] = kwargs[param]
+        self._indexed = None  # The (category, argument types) this function is indexed by, while it is registered.
+        # Block parameters given as strings are parsed when they are first looked up. Block parameters which are not in
+        # the schema are ignored.
+        self.block_params = BlockParameterDict.from_valid_map(
+            self._BLOCK_PARAMETERS,
+            {param: kwargs[param] for param in self._BLOCK_PARAMETERS.parsers if param in kwargs},
+            owner=self)
 
         try:
-            self.argument_types = kwargs['argument_types']
+            self._argument_types = intern_argument_types(kwargs['argument_types'])
         except KeyError:
-            self.argument_types = []
+            self._argument_types = ()
+
+        # The category is only resolved when it is looked up, but a function whose category is not defined must not be
+        # created, so the reference is checked now.
+        if not self.block_params.is_parsed('Category'):
+            category = self.block_params.get_text('Category')
+            workspace = getattr(self, '_workspace', None) or Workspace.get_active()
+            if category not in workspace.get_namespace(u'TriggerCategories'):
+                raise TriggerSyntaxException('Symbol ' + category + ' is not defined.')
 
         super(TriggerEditorFunction, self).__init__(**kwargs)
 
+    @property
+    def argument_types(self):
+        # type: () -> tuple[str]
+        return self._argument_types
+
+    @argument_types.setter
+    def argument_types(self, argument_types):
+        # type: (list[str]) -> None
+        self._argument_types = intern_argument_types(argument_types)
+        self._reindex()
+
+    def _index(self):
+        category = self.block_params.get_text('Category')
+        if category is not None:
+            references = self._category_references.get(category)
+            if references is None:
+                references = self._category_references[category] = set()
+            references.add(self)
+        argument_types = self._argument_types
+        for argument_type in argument_types:
+            references = self._type_references.get(argument_type)
+            if references is None:
+                references = self._type_references[argument_type] = set()
+            references.add(self)
+        self._indexed = (category, argument_types)
+
+    def _unindex(self):
+        category, argument_types = self._indexed
+        if category is not None:
+            _discard_reference(self._category_references, category, self)
+        for argument_type in argument_types:
+            _discard_reference(self._type_references, argument_type, self)
+        self._indexed = None
+
+    def _reindex(self):
+        """Updates the indexes after the category or the argument types of a registered function have changed."""
+        if self._indexed is not None:
+            self._unindex()
+            self._index()
+
+    def _block_params_changed(self):
+        if self._indexed is not None and self._indexed[0] != self.block_params.get_text('Category'):
+            self._reindex()
+
+    @staticmethod
+    def get_category_references(category_name, workspace=None):
+        # type: (str, Workspace) -> set[TriggerEditorFunction]
+        """
+        Returns the set of registered functions whose category has the given name, in a workspace (by default, the
+        active workspace).
+        """
+        return set(_CATEGORY_REFERENCES.get(workspace).get(category_name, ()))
+
+    @staticmethod
+    def rename_category_references(old_name, new_name, workspace=None):
+        # type: (str, str, Workspace) -> None
+        """
+        Updates the functions of a category that was renamed from old_name to new_name, in a workspace (by default, the
+        active workspace). Category block parameters that have not been parsed yet are given the new name. Parsed ones
+        already refer to the category itself. Either way, the functions are indexed by the new name.
+        """
+        for function_ in TriggerEditorFunction.get_category_references(old_name, workspace):
+            if function_.block_params.is_parsed('Category'):
+                function_._block_params_changed()
+            else:
+                function_.block_params['Category'] = new_name  # Indexes the function by the new name.
+
+    @staticmethod
+    def get_type_references(type_name, workspace=None):
+        # type: (str, Workspace) -> set[TriggerEditorFunction]
+        """
+        Returns the set of registered functions that take an argument of the given type, in a workspace (by default,
+        the active workspace).
+        """
+        return set(_TYPE_REFERENCES.get(workspace).get(type_name, ()))
+
+    @staticmethod
+    def has_category_references(category_name, workspace=None):
+        # type: (str, Workspace) -> bool
+        return bool(_CATEGORY_REFERENCES.get(workspace).get(category_name))
+
+    @staticmethod
+    def has_type_references(type_name, workspace=None):
+        # type: (str, Workspace) -> bool
+        return bool(_TYPE_REFERENCES.get(workspace).get(type_name))
+
     @classmethod
     def supports(cls, keyword_arg):
         # type: (basestring) -> bool
         """According to testing, TriggerEvents and TriggerCalls do not support the Scriptname block parameter."""
-        return keyword_arg in cls._VALID_BLOCK_PARAMETERS
+        return keyword_arg in cls._BLOCK_PARAMETERS
+
+    @classmethod
+    def check_kwargs(cls, kwargs):
+        """
+        Besides duplicate names, block parameters that cannot be converted are errors, even though they are only
+        converted when they are looked up, and so is a category that is not defined. Argument types that are not
+        defined are warnings, because the function can still be created.
+        """
+        for problem in super(TriggerEditorFunction, cls).check_kwargs(kwargs):
+            yield problem
+
+        for param, parser in cls._BLOCK_PARAMETERS.parsers.iteritems():
+            if param not in kwargs or not isinstance(kwargs[param], basestring):
+                continue
+            if parser is ParamCategory:
+                if kwargs[param] not in cls.get_namespace(u'TriggerCategories'):
+                    yield 'Symbol ' + kwargs[param] + ' is not defined.', SEVERITY_ERROR
+                continue
+            try:
+                parser(kwargs[param])
+            except (ValueError, TriggerSyntaxException) as error:
+                yield "Invalid %s block parameter '%s': %s" % (param, kwargs[param], error), SEVERITY_ERROR
+
+        types = cls.get_namespace(u'TriggerTypes')
+        for position, argument_type in enumerate(kwargs.get('argument_types', ()), 1):
+            if not argument_type:
+                yield 'Argument %d has no type.' % position, SEVERITY_WARNING
+            elif argument_type != 'nothing' and argument_type not in types:
+                yield 'Argument %d has the type %s, which is not defined.' % (position, argument_type), SEVERITY_WARNING
 
     @staticmethod
     def parse_from_text(block):
@@ -49,27 +191,73 @@ class TriggerEditorFunction(TriggerEditorObject):
         kwargs = super(TriggerEditorFunction, TriggerEditorFunction).parse_from_text(block)
 
         for line in block[1:]:
-            param = get_line_param(line)
-            kwargs[param] = parse_block_parameter(param, get_line_data(line))
+            record = as_record(line)
+            kwargs[record.param] = record.data
 
         return kwargs
 
+    @classmethod
+    def _parse_row_block_params(cls, block):
+        # type: (list) -> list[tuple[str, str]]
+        """
+        Returns the block parameters of a block for parse_row, as a list of (parameter, string) tuples. As in __init__,
+        they are listed in the order of the schema and block parameters which are not in the schema are left out.
+        """
+        block_params = {}
+        for line in block[1:]:
+            record = as_record(line)
+            block_params[record.param] = record.data
+        return [(param, block_params[param]) for param in cls._BLOCK_PARAMETERS.parsers if param in block_params]
+
+    def _set_function_row(self, name, argument_types, block_params):
+        """Sets the attributes that every function has, for _set_row."""
+        self._name = name
+        self._indexed = None
+        self._argument_types = intern_argument_types(argument_types)
+        self.block_params = BlockParameterDict.from_valid_map(self._BLOCK_PARAMETERS, dict(block_params), owner=self)
+
     def convert_to_block(self):
         return "%s=%s\n%s" % (self.name, ','.join((str(x) for x in self.params())), '\n'.join(self.block_params_str()))
 
     def block_params_str(self):
-        return (("_%s_%s=%s" % (self.name, param, str(value))) for param, value in self.block_params.items())
+        """Block parameters that have not been looked up are written from their text, without parsing them."""
+        return (("_%s_%s=%s" % (self.name, param, self.block_params.get_text(param))) for param in self.block_params)
 
 
 # ======================================================================================================================
 # Utilities
 # ======================================================================================================================
 
-def iter_all_functions():
-    # type: () -> Iterator[TriggerEditorFunction]
+def _discard_reference(index, key, function_):
+    references = index.get(key)
+    if references is not None:
+        references.discard(function_)
+        if not references:
+            del index[key]
+
+
+_ARGUMENT_TYPES_TRACKER = {}
+
+
+def intern_argument_types(argument_types):
+    # type: (list[str]) -> tuple[str]
+    """
+    Returns argument_types as a tuple. Functions that take the same argument types share the same tuple.
+    """
+    argument_types = tuple(argument_types)
+    try:
+        return _ARGUMENT_TYPES_TRACKER[argument_types]
+    except KeyError:
+        _ARGUMENT_TYPES_TRACKER[argument_types] = argument_types
+        return argument_types
+
+
+def iter_all_functions(workspace=None):
+    # type: (Workspace) -> Iterator[TriggerEditorFunction]
+    """Yields the registered functions of a workspace (by default, the active workspace)."""
     function_classes = [TriggerEditorFunction] + list(TriggerEditorFunction.get_subclasses())
 
     for class_ in function_classes:
         if class_.supports('Category'):
-            for function_ in class_.get_class_instances():
+            for function_ in class_.get_class_instances(workspace):
                 yield function_
@@ -1,17 +1,24 @@
-from typing import Dict
 import abc
 
-from utilities import get_line_key
+from utilities import as_record
 from my_collections import NameTracker
 from my_exceptions import TriggerSyntaxException
+from workspace import Workspace, SectionNamespace
+from diagnostics import SEVERITY_ERROR
 
 
 class TriggerEditorObject(object):
-    _instances = NameTracker()
-    _class_sets = {}  # type: Dict[class, set]
+    _SECTION = None  # type: str  # The section whose name table holds the instances of the class.
+    _instances = SectionNamespace()  # type: NameTracker  # The name table of _SECTION in the object's workspace.
 
     """
     An abstract class that represents an object which can be referenced by other objects within TriggerData.txt.
+
+    Every section has its own namespace, so objects of different sections may have the same name (for example, the
+    boolean TriggerType and the boolean TriggerTypeDefault). A concrete subclass declares its section in _SECTION.
+    References to objects of other sections must be looked up explicitly, with get_object_from_name or find_object.
+
+    Objects are registered in the active Workspace when they are created, and belong to it afterwards.
     """
     __metaclass__ = abc.ABCMeta
 
@@ -29,15 +36,82 @@ class TriggerEditorObject(object):
         super(TriggerEditorObject, self).__init__()
 
         self._name = kwargs['name']
-        self._instances[self._name] = self
-        self._class_sets[type(self)].add(self)
+        # Objects that are updated in place (see update) stay in their workspace.
+        if getattr(self, '_workspace', None) is None:
+            self._workspace = Workspace.get_active()
+        self._register()
 
-    def __del__(self):
-        self.remove()
+    def _register(self):
+        self._instances[self._name] = self  # Raises a TriggerSyntaxException if the name already exists.
+        self._workspace.class_sets[type(self)].add(self)
+        self._index()
 
     def remove(self):
         del self._instances[self._name]
-        self._class_sets[type(self)].remove(self)
+        self._workspace.class_sets[type(self)].remove(self)
+        self._unindex()
+
+    def is_registered(self):
+        # type: () -> bool
+        """
+        Returns whether the object is registered in its workspace. Objects that were never registered (for example,
+        because their name already exists) or that were removed are not.
+        """
+        return self._instances.get(self._name) is self
+
+    # noinspection PyProtectedMember
+    @staticmethod
+    def dispose(objects):
+        """
+        Removes many objects at once. Unlike remove, no checks are made before removing each object (for example,
+        TriggerCategory.remove refuses to remove a category that is still referenced), so the objects can be removed
+        in any order. Objects that are not registered are ignored.
+
+        Objects are never removed implicitly when they are garbage collected: they stay registered until they are
+        removed, disposed or their workspace is cleared.
+        """
+        class_sets = {}  # Maps each (workspace, class) to the objects that are removed from its class set.
+        for obj in objects:
+            instances = obj._instances.instances
+            if instances.get(obj._name) is obj:
+                del instances[obj._name]
+                obj._unindex()
+                class_sets.setdefault((obj._workspace, type(obj)), []).append(obj)
+        for (workspace, class_), removed in class_sets.iteritems():
+            workspace.class_sets[class_].difference_update(removed)
+
+    def _index(self):
+        """Called when the object is registered. Subclasses which keep indexes of their instances override this."""
+        pass
+
+    def _unindex(self):
+        """Called when the object is removed. Undoes _index."""
+        pass
+
+    def _renamed(self, old_name):
+        """Called when a registered object is renamed. Subclasses whose name is referenced elsewhere override this."""
+        pass
+
+    def update(self, **kwargs):
+        """
+        Re-initializes the object from a new set of keyword arguments, as returned by parse_from_text. The object keeps
+        its identity, so references held by other objects remain valid.
+
+        If the arguments are invalid (for example, if the new name already exists or a flag is not a number), the
+        exception is raised and the object is restored to its previous state, still registered.
+        """
+        TriggerEditorObject.remove(self)
+        state = self.__dict__.copy()
+        try:
+            self.__init__(**kwargs)
+        except Exception:
+            # __init__ may have failed after registering the object with its new state.
+            if self.is_registered():
+                TriggerEditorObject.remove(self)
+            self.__dict__.clear()
+            self.__dict__.update(state)
+            self._register()
+            raise
 
     @property
     def name(self):
@@ -47,16 +121,25 @@ class TriggerEditorObject(object):
     @name.setter
     def name(self, new_name):
         # type: (str) -> None
-        self._instances[new_name] = self
-        self.__del__()
-        self._name = new_name
+        """Renames the object. If it is registered, it is registered under the new name and stays in its class set."""
+        if not self.is_registered():
+            self._name = new_name
+            return
+        self._instances[new_name] = self  # Raises a TriggerSyntaxException if the name already exists.
+        self._unindex()
+        del self._instances[self._name]
+        old_name, self._name = self._name, new_name
+        self._index()
+        self._renamed(old_name)
 
     def __str__(self):
         return self._name
 
     @classmethod
-    def get_class_instances(cls):
-        return cls._class_sets[cls]
+    def get_class_instances(cls, workspace=None):
+        # type: (Workspace) -> set
+        """Returns the set of registered instances of the class in a workspace (by default, the active workspace)."""
+        return (workspace if workspace is not None else Workspace.get_active()).class_sets[cls]
 
     @classmethod
     def get_subclasses(cls):
@@ -65,13 +148,48 @@ class TriggerEditorObject(object):
                 yield subsubclass
             yield subclass
 
+    @staticmethod
+    def get_namespace(section, workspace=None):
+        # type: (str, Workspace) -> NameTracker
+        """
+        Returns the name table of a section in a workspace (by default, the active workspace), creating it if it does
+        not exist yet.
+        """
+        return (workspace if workspace is not None else Workspace.get_active()).get_namespace(section)
+
     @classmethod
-    def get_object_from_name(cls, name):
-        # type: (str) -> TriggerEditorObject
-        try:
-            return cls._instances[name]
-        except KeyError:
+    def get_object_from_name(cls, name, section=None, workspace=None):
+        # type: (str, str, Workspace) -> TriggerEditorObject
+        """
+        Returns the object with the given name in a section of a workspace (by default, the active workspace). If no
+        section is given, the section of the class is used. If the class has no section (for example,
+        TriggerEditorObject itself), every section is searched (see find_object).
+        """
+        if section is None and cls._SECTION is None:
+            obj = cls.find_object(name, workspace=workspace)
+        else:
+            obj = cls.get_namespace(section if section is not None else cls._SECTION, workspace).get(name)
+        if obj is None:
             raise TriggerSyntaxException('Symbol ' + name + ' is not defined.')
+        return obj
+
+    @staticmethod
+    def find_object(name, sections=None, workspace=None):
+        # type: (str, list[str], Workspace) -> TriggerEditorObject
+        """
+        Looks a name up in several sections, for references which may point to objects of more than one section.
+
+        :param sections: The sections to search, in order. By default, every section of the workspace is searched, in
+        the order in which their name tables were created.
+        :param workspace: The workspace to search. By default, the active workspace.
+        :return: The first object found, or None if no section declares the name.
+        """
+        namespaces = (workspace if workspace is not None else Workspace.get_active()).namespaces
+        for section in (sections if sections is not None else namespaces):
+            namespace = namespaces.get(section)
+            if namespace is not None and name in namespace.instances:
+                return namespace.instances[name]
+        return None
 
     @staticmethod
     def parse_from_text(block):
@@ -95,8 +213,91 @@ class TriggerEditorObject(object):
         :rtype: dict
         """
 
-        kwargs = {'name': get_line_key(block[0])}
+        kwargs = {'name': as_record(block[0]).key}
         return kwargs
 
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        """
+        Parses a block into a row: a tuple of the values of the object, in the order expected by _set_row. Unlike
+        parse_from_text, no dict is built. Rows only contain plain data, so they can be stored in the parse cache.
+
+        The row of a TriggerEditorObject only holds its name. Subclasses override this and _set_row to add their own
+        values (see build_trusted).
+        """
+        return as_record(block[0]).key,
+
+    def _set_row(self, row):
+        """Sets the attributes of a new object from a row returned by parse_row."""
+        self._name = row[0]
+
+    @classmethod
+    def build_trusted(cls, rows):
+        # type: (list[tuple]) -> list
+        """
+        Creates objects from rows returned by parse_row and registers them in bulk with a TrustedBatch. __init__ is not
+        called and the values are not checked, so this must only be used for files that are known to be valid (see
+        is_trusted_file). If a name already exists, a TriggerSyntaxException is raised and none of the objects are
+        registered.
+        """
+        workspace = Workspace.get_active()
+        new = object.__new__
+        batch = TrustedBatch()
+        for row in rows:
+            obj = new(cls)
+            obj._workspace = workspace
+            obj._set_row(row)
+            batch.objects.append(obj)
+        batch.register()
+        return batch.objects
+
+    @classmethod
+    def check_kwargs(cls, kwargs):
+        # type: (dict) -> Iterator[tuple[str, str]]
+        """
+        Yields a (message, severity) tuple for every problem that creating an object from kwargs (as returned by
+        parse_from_text) would have, without creating it. An object should not be created if any problem is an error.
+        Subclasses extend this with the checks of their own arguments.
+        """
+        if kwargs['name'] in cls._instances:
+            yield kwargs['name'] + ": this symbol already exists!", SEVERITY_ERROR
+
     def convert_to_block(self):
         return "%s=%s" % (self.name, ','.join((str(param) for param in self.params())))
+
+
+class TrustedBatch(object):
+    """
+    Registers many objects that were created without being registered, such as the objects of a file that is known to
+    be valid (see TriggerEditorObject.build_trusted).
+
+    The objects are not registered one by one. Instead, their names are checked for duplicates with a single set
+    operation, then they are added to the name table and to their class sets all at once. If a name already exists,
+    none of the objects are registered. Objects in a batch may belong to different sections, and each one is checked
+    against the name table of its own section.
+    """
+
+    def __init__(self, objects=None):
+        self.objects = list(objects) if objects is not None else []  # type: list[TriggerEditorObject]
+
+    # noinspection PyProtectedMember
+    def register(self):
+        sections = {}  # Maps each (workspace, section) to the objects of the batch that belong to it.
+        for obj in self.objects:
+            sections.setdefault((obj._workspace, obj._SECTION), []).append(obj)
+
+        updates = []
+        for (workspace, section), objects in sections.iteritems():
+            instances = workspace.get_namespace(section).instances
+            names = {obj._name: obj for obj in objects}
+            if len(names) != len(objects) or instances.viewkeys() & names.viewkeys():
+                duplicates = [obj._name for obj in objects if obj._name in instances or names[obj._name] is not obj]
+                raise TriggerSyntaxException(duplicates[0] + ": this symbol already exists!")
+            updates.append((instances, names))
+
+        for instances, names in updates:
+            instances.update(names)
+        for obj in self.objects:
+            obj._workspace.class_sets[type(obj)].add(obj)
+            obj._index()
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+from utilities import as_record
+from we_object import TriggerEditorObject
+from workspace import WorkspaceAttribute
+from my_types import WC3Version
+
+
+# Maps variable types to the presets of that type, by name, in each workspace.
+_PRESETS = WorkspaceAttribute(dict)
+
+
+class TriggerParam(TriggerEditorObject):
+    """
+    [TriggerParams]
+        Defines possible values for variable types
+        Key: arbitrary text
+        Value 0: first game version in which this parameter is valid
+        Value 1: variable type
+        Value 2: code text (used in script)
+        Value 3: display text
+
+    Note: If the code text is a literal string, it is surrounded with backward single quotes (`).
+
+    The presets of each variable type are indexed, so they can be looked up with get_presets and has_preset.
+    """
+
+    _SECTION = u'TriggerParams'
+
+    _presets = _PRESETS  # type: dict[str, OrderedDict[str, TriggerParam]]
+    _variable_types = {}  # type: dict[str, str]  # Shares a single string object between presets of the same type.
+
+    def __init__(self, **kwargs):
+        # The variable type must be known when the object is registered, because that is when it is indexed.
+        self._variable_type = self._variable_types.setdefault(kwargs['variable_type'], kwargs['variable_type'])
+        super(TriggerParam, self).__init__(**kwargs)
+
+        self.minimum_version = WC3Version(kwargs['minimum_version'])
+        self.code_text = kwargs['code_text']
+        self.display_text = kwargs['display_text']
+
+    def params(self):
+        yield self.minimum_version
+        yield self.variable_type
+        yield self.code_text
+        yield self.display_text
+
+    @property
+    def variable_type(self):
+        # type: () -> str
+        return self._variable_type
+
+    @variable_type.setter
+    def variable_type(self, new_type):
+        # type: (str) -> None
+        registered = self.is_registered()
+        if registered:
+            self._unindex()
+        self._variable_type = self._variable_types.setdefault(new_type, new_type)
+        if registered:
+            self._index()
+
+    def _index(self):
+        presets = self._presets.get(self._variable_type)
+        if presets is None:
+            presets = self._presets[self._variable_type] = OrderedDict()
+        presets[self._name] = self
+
+    def _unindex(self):
+        presets = self._presets.get(self._variable_type)
+        if presets is not None and presets.get(self._name) is self:
+            del presets[self._name]
+            if not presets:
+                del self._presets[self._variable_type]
+
+    @staticmethod
+    def get_presets(variable_type, workspace=None):
+        # type: (str, Workspace) -> OrderedDict[str, TriggerParam]
+        """
+        Returns the presets of a variable type, by name, in a workspace (by default, the active workspace). The
+        returned OrderedDict must not be modified.
+        """
+        return _PRESETS.get(workspace).get(variable_type, OrderedDict())
+
+    @staticmethod
+    def has_preset(variable_type, name, workspace=None):
+        # type: (str, str, Workspace) -> bool
+        return name in _PRESETS.get(workspace).get(variable_type, ())
+
+    @staticmethod
+    def parse_from_text(block):
+        # type: (list) -> dict
+        kwargs = super(TriggerParam, TriggerParam).parse_from_text(block)
+
+        declaration = as_record(block[0]).values
+
+        kwargs['minimum_version'] = int(declaration[0])
+        kwargs['variable_type'] = declaration[1]
+        kwargs['code_text'] = declaration[2]
+        kwargs['display_text'] = declaration[3]
+
+        return kwargs
+
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        return record.key, int(declaration[0]), declaration[1], declaration[2], declaration[3]
+
+    def _set_row(self, row):
+        self._name, minimum_version, variable_type, self.code_text, self.display_text = row
+        self._variable_type = self._variable_types.setdefault(variable_type, variable_type)
+        self.minimum_version = WC3Version(minimum_version)
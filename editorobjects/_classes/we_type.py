@@ -1,8 +1,9 @@
-from we_function import iter_all_functions
-from utilities import get_line_data
+from we_function import TriggerEditorFunction
+from utilities import as_record, is_integer
 from we_object import TriggerEditorObject
 from we_referable import TriggerEditorReferable
 from my_types import IntBool, WC3Version
+from diagnostics import SEVERITY_ERROR
 
 
 class TriggerType(TriggerEditorObject, TriggerEditorReferable):
@@ -19,6 +20,8 @@ class TriggerType(TriggerEditorObject, TriggerEditorReferable):
         Value 6: flag (0 or 1) indicating to treat this type as the base type in the editor
     """
 
+    _SECTION = u'TriggerTypes'
+
     def __init__(self, **kwargs):
         super(TriggerType, self).__init__(**kwargs)
 
@@ -43,24 +46,25 @@ class TriggerType(TriggerEditorObject, TriggerEditorReferable):
             yield self.treat_as_base
 
     def is_referenced(self):
-        for function_ in iter_all_functions():
-            if self.name in function_.argument_types:
-                return True
-        return False
+        return TriggerEditorFunction.has_type_references(self.name, self._workspace)
 
     def get_references(self):
-        result = set()
-        for function_ in iter_all_functions():
-            if self.name in function_.argument_types:
-                result.add(function_)
-        return result
+        return TriggerEditorFunction.get_type_references(self.name, self._workspace)
+
+    @classmethod
+    def check_kwargs(cls, kwargs):
+        for problem in super(TriggerType, cls).check_kwargs(kwargs):
+            yield problem
+        for key in ('minimum_version', 'is_global', 'comparable', 'treat_as_base'):
+            if key in kwargs and not is_integer(kwargs[key]):
+                yield "%s must be a number, not '%s'." % (key, kwargs[key]), SEVERITY_ERROR
 
     @staticmethod
     def parse_from_text(block):
         # type: (list) -> dict
         kwargs = super(TriggerType, TriggerType).parse_from_text(block)
 
-        declaration = get_line_data(block[0]).split(',')
+        declaration = as_record(block[0]).values
 
         kwargs['minimum_version'] = declaration[0]
         kwargs['is_global'] = declaration[1]
@@ -75,3 +79,20 @@ class TriggerType(TriggerEditorObject, TriggerEditorReferable):
             pass
 
         return kwargs
+
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        optional = declaration[4:7]  # base_type, import_type and treat_as_base, which are None when not declared.
+        optional += [None] * (3 - len(optional))
+        return (record.key, declaration[0], declaration[1], declaration[2], declaration[3]) + tuple(optional)
+
+    def _set_row(self, row):
+        (self._name, minimum_version, is_global, comparable, self.display_name, self.base_type, self.import_type,
+         treat_as_base) = row
+        self.minimum_version = WC3Version(minimum_version)
+        self.is_global = IntBool(is_global)
+        self.comparable = IntBool(comparable)
+        self.treat_as_base = IntBool(treat_as_base) if treat_as_base is not None else None
@@ -1,8 +1,9 @@
-from utilities import get_line_data, get_line_key
+from utilities import as_record
 from we_object import TriggerEditorObject
 
 
 class TriggerTypeDefault(TriggerEditorObject):
+    _SECTION = u'TriggerTypeDefaults'
 
     def __init__(self, **kwargs):
         super(TriggerTypeDefault, self).__init__(**kwargs)
@@ -30,17 +31,25 @@ class TriggerTypeDefault(TriggerEditorObject):
         :return:
         :rtype: dict
         """
-        declaration = get_line_data(block[0]).split(',')
-        kwargs = {'name': get_line_key(block[0])+"_DEFAULT_",
+        record = as_record(block[0])
+        declaration = record.values
+        kwargs = {'name': record.key,
                   'script_text': declaration[0]}
         if len(declaration) > 1:
             kwargs['display_text'] = declaration[1]
         return kwargs
 
+    @classmethod
+    def parse_row(cls, block):
+        # type: (list) -> tuple
+        record = as_record(block[0])
+        declaration = record.values
+        return record.key, declaration[0], declaration[1] if len(declaration) > 1 else None
+
+    def _set_row(self, row):
+        self._name, self.script_text, self.display_text = row
+
     def params(self):
         yield self.script_text
         if self.display_text:
             yield self.display_text
-
-    def convert_to_block(self):
-        return "%s=%s" % (self.name.replace("_DEFAULT_", ""), ','.join((str(param) for param in self.params())))
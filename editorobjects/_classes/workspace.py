@@ -0,0 +1,110 @@
+"""
+This module contains the Workspace, which holds the registered TriggerEditorObjects of one TriggerData file (with the
+packages loaded on top of it). Several workspaces can exist at the same time, so different files can be loaded side by
+side without tearing down the objects of the others.
+"""
+from collections import OrderedDict, defaultdict
+
+from my_collections import NameTracker
+
+
+class Workspace(object):
+    """
+    Owns a set of registered TriggerEditorObjects: the name table of each section, the set of instances of each class
+    and the indexes kept by the classes (see WorkspaceAttribute).
+
+    New objects are registered in the active workspace and stay in it. A workspace is activated by using it as a
+    context manager. If no workspace has been activated, a default workspace is used.
+
+        with Workspace() as base:
+            base_data = main.load_data(main.read_path('TriggerData.txt'))
+        with Workspace() as variant:
+            variant_data = main.load_data(main.read_path('a.txt'))
+
+    Lookups made through a class (for example, TriggerType.get_object_from_name) use the active workspace, unless a
+    workspace is passed to them explicitly. Lookups made through an object (for example, TriggerCategory.get_references)
+    use the workspace of the object.
+    """
+    _active = None  # type: Workspace
+
+    def __init__(self):
+        self.namespaces = OrderedDict()  # type: OrderedDict[str, NameTracker]  # Maps section names to name tables.
+        self.class_sets = defaultdict(set)  # type: dict[type, set]
+        self.attributes = {}  # type: dict[WorkspaceAttribute, object]
+        self._previous = []  # type: list[Workspace]
+
+    @staticmethod
+    def get_active():
+        # type: () -> Workspace
+        if Workspace._active is None:
+            Workspace._active = Workspace()
+        return Workspace._active
+
+    def __enter__(self):
+        self._previous.append(Workspace._active)
+        Workspace._active = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Workspace._active = self._previous.pop()
+
+    def get_namespace(self, section):
+        # type: (str) -> NameTracker
+        """Returns the name table of a section, creating it if it does not exist yet."""
+        try:
+            return self.namespaces[section]
+        except KeyError:
+            namespace = self.namespaces[section] = NameTracker()
+            return namespace
+
+    def clear(self):
+        """
+        Unregisters every object of the workspace at once, by replacing its tables instead of removing the objects one
+        by one. Objects that are still referenced elsewhere are no longer registered anywhere. The objects that are not
+        referenced elsewhere are freed, so a workspace that is no longer needed should be cleared (or simply dropped).
+        """
+        self.namespaces = OrderedDict()
+        self.class_sets = defaultdict(set)
+        self.attributes = {}
+
+
+def _get_workspace(obj):
+    workspace = getattr(obj, '_workspace', None)
+    return workspace if workspace is not None else Workspace.get_active()
+
+
+class WorkspaceAttribute(object):
+    """
+    A class attribute whose value is kept separately by each Workspace, such as an index of the instances of a class.
+
+    Accessed through an object, it is the value of the object's workspace. Accessed through the class, it is the value
+    of the active workspace. The value is created by calling factory the first time it is used in a workspace.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __get__(self, obj, cls):
+        return self.get(_get_workspace(obj))
+
+    def get(self, workspace=None):
+        """Returns the value of a workspace (by default, the active workspace)."""
+        if workspace is None:
+            workspace = Workspace.get_active()
+        try:
+            return workspace.attributes[self]
+        except KeyError:
+            value = workspace.attributes[self] = self.factory()
+            return value
+
+
+class SectionNamespace(object):
+    """
+    The _instances attribute of TriggerEditorObjects: the name table of the class's section (_SECTION) in the workspace
+    of the object, or in the active workspace when accessed through the class. It is None for classes without a section.
+    """
+
+    def __get__(self, obj, cls):
+        if cls._SECTION is None:
+            return None
+        return _get_workspace(obj).get_namespace(cls._SECTION)
@@ -29,10 +29,20 @@ Try to load package:
 
 from semver_utils import DependencyError, SemVerPackageTracker
 from py2exeUtils import scriptDir as SCRIPT_PATH
+from editorfiles.encoding import read_text
 import io
 
 
-def fopen(file, mode='r', buffering=-1, encoding="utf-8", errors=None, newline=None, closefd=True):
+def fopen(file, mode='r', buffering=-1, encoding=None, errors=None, newline=None, closefd=True):
+    """
+    Same as io.open, but files opened for reading in text mode without an encoding are decoded at once, with the encoding
+    detected from their contents (see editorfiles.encoding), and returned as an io.StringIO. Files opened for writing
+    in text mode without an encoding use UTF-8.
+    """
+    if encoding is None and 'b' not in mode:
+        if mode.strip('rtU') == '':
+            return io.StringIO(read_text(file)[0], newline=newline)
+        encoding = "utf-8"
     return io.open(file, mode=mode, buffering=buffering, encoding=encoding, errors=errors, newline=newline, closefd=closefd)
 
 
@@ -1,27 +1,46 @@
 from editorobjects import TriggerEditorObject
+from editorfiles.strings import StringTable, StringFile
 
 
 class TriggerEditorPackage(object):
 
     def __init__(self):
         self._objects = set()
+        self._string_overlays = []  # type: list[tuple[StringTable, StringFile]]
 
     def unload(self):
         """
-        Removes all TriggerEditorObjects inside the package from the package itself and global namespace.
+        Removes all TriggerEditorObjects inside the package from the package itself and global namespace. Also removes
+        the package's string files from their string tables.
         """
-        for weobj in self._objects:
-            weobj.remove()
+        TriggerEditorObject.dispose(self._objects)
         self._objects.clear()
 
-    def remove(self, package):
+        for table, string_file in self._string_overlays:
+            table.remove_overlay(string_file)
+        self._string_overlays = []
+
+    def add_strings(self, table, path, encoding=None):
+        """
+        Adds a string file shipped with the package on top of a string table (see editorfiles.StringTable). Its values
+        take precedence over the values of the files that were added before it, until the package is unloaded.
+
+        :type table: StringTable
+        """
+        self._string_overlays.append((table, table.add_overlay(path, encoding)))
+
+    def remove(self, package, section=None):
         """
         Removes a TriggerEditorObject from the package and from the global namespace.
 
         :type package: basestring, TriggerEditorObject
+        :param section: The section of the object, which is required when it is given by name, because objects of
+        different sections may have the same name (for example, a TriggerType and its TriggerTypeDefault).
         """
         if isinstance(package, basestring):
-            package = TriggerEditorObject.get_object_from_name(package)  # type: TriggerEditorObject
+            if section is None:
+                raise TypeError('The section of ' + package + ' must be given to remove it by name.')
+            package = TriggerEditorObject.get_object_from_name(package, section)  # type: TriggerEditorObject
 
         self._objects.remove(package)
         package.remove()
@@ -3,61 +3,196 @@ from my_exceptions import TriggerSyntaxException
 import editorobjects as weobj
 import editorpackages as wepakg
 from collections import OrderedDict
+from itertools import chain
 from my_collections import BlockParser
-import re
-import io
+from editorfiles.lexer import tokenize, TOKEN_SECTION, TOKEN_BLOCK_MEMBER
+from editorfiles.mapped import MappedTriggerData
+from editorfiles.encoding import read_text
 
 
-def minimize_line(string):
-    # type: (str) -> str
-    """Removes all comments and whitespace from a line."""
+def read_file(file_handle):
+    contents = BlockParser()
+    for token in tokenize(file_handle):
+        if token.kind == TOKEN_SECTION:
+            contents.new_category(token.key, token.line_number)
+        elif token.kind == TOKEN_BLOCK_MEMBER:
+            contents.add_line(token.text)
+        else:
+            contents.new_block(token.line_number)
+            contents.add_line(token.text)
+    return contents
 
-    string_uncommented = string[:string.find('//')]
 
-    # regex whitespace removal => don't remove whitespaces that are between quotation marks
-    # https://stackoverflow.com/questions/9577930/regular-expression-to-select-all-whitespace-that-isnt-in-quotes
-    return re.sub(r'\s+(?=(?:[^\'"]*[\'"][^\'"]*[\'"])*[^\'"]*$)', '', string_uncommented, flags=re.UNICODE)
+def read_path(path, encoding=None):
+    """
+    Reads a file from its path. The whole file is decoded at once, with the given encoding or with the encoding detected
+    from its contents (see editorfiles.encoding), instead of line by line.
+    """
+    text, _, _ = read_text(path, encoding)
+    return read_file(text.split(u'\n'))
+
+
+def iter_objects(file_handle):
+    """
+    Yields a (section, TriggerEditorObject) tuple for each block of a file as soon as the block is closed, without
+    building a BlockParser. Only one block is held in memory at a time. Blocks in sections that are not recognized are
+    skipped. Blocks with syntax errors are printed and skipped.
+    """
+    sections = set()
+    section = None
+    parser = None
+    block = None
+
+    # The trailing None closes the last block of the file.
+    for token in chain(tokenize(file_handle), [None]):
+        if token is not None and token.kind == TOKEN_BLOCK_MEMBER:
+            if block is None:
+                raise TriggerSyntaxException('Block member found outside block!')
+            block.append(token.text)
+            continue
 
+        if block is not None and parser is not None:
+            try:
+                obj = parser.parse_block_to_object(block)
+            except weobj.INVALID_BLOCK_ERRORS as e:
+                print block
+                print e
+            else:
+                yield section, obj
+        block = None
 
-INDICATOR_CATEGORY = '['
-INDICATOR_BLOCK_MEMBER = '_'
+        if token is None:
+            break
+        elif token.kind == TOKEN_SECTION:
+            if token.key in sections:
+                raise TriggerSyntaxException('Category ' + token.key + ' already exists!')
+            sections.add(token.key)
+            section = token.key
+            parser = None
+            if weobj.TriggerEditorObjectParser.supports(section):
+                parser = weobj.TriggerEditorObjectParser(section)
+        else:
+            block = [token.text]
 
 
-def read_file(file_handle):
-    contents = BlockParser()
-    for line in file_handle:
-        line = minimize_line(line)
-        if line != '':
-            if line[0] == INDICATOR_CATEGORY:
-                contents.new_category(line[1:-1])
-            elif line[0] == INDICATOR_BLOCK_MEMBER:
-                contents.add_line(line)
-            else:
-                contents.new_block()
-                contents.add_line(line)
-    return contents
+def read_mapped_file(path, encoding=None):
+    """
+    Reads a file through a MappedTriggerData object instead of a decoded file handle.
 
+    The returned BlockParser only indexes the file: each section is parsed the first time it is accessed, so sections
+    that are never accessed are never decoded or tokenized. It keeps the file open until every section has been parsed,
+    so it should be closed (or used as a context manager) once the sections that are needed have been accessed:
 
-if __name__ == "__main__":
-    with io.open('a.txt', 'r', encoding="utf-8-sig") as f:
-        blocks = read_file(f)
+        with read_mapped_file('TriggerData.txt') as blocks:
+            categories = blocks['TriggerCategories']
+    """
+    return BlockParser(MappedTriggerData(path, encoding))
 
-    data = OrderedDict()
+
+def load_data(blocks, report=None, trusted=False):
+    """
+    Creates the TriggerEditorObjects declared in a BlockParser. Blocks with syntax errors are printed and skipped.
+
+    If a DiagnosticReport is given, blocks with syntax errors and unrecognized sections are recorded in it instead of
+    being printed.
+
+    See build_data for the trusted argument.
+
+    :return: An OrderedDict which maps section names to OrderedDicts of objects by name.
+    """
+    parsed_sections = OrderedDict()
     for we_type in blocks:
-        try:
-            parser = weobj.TriggerEditorObjectParser(we_type)
-        except TriggerSyntaxException:
+        if not weobj.TriggerEditorObjectParser.supports(we_type):
+            if we_type in weobj.DEFAULT_TRIGGER_SECTIONS:
+                continue  # See load_default_triggers.
+            if report is not None:
+                report.add(we_type, blocks.section_line_number(we_type), None,
+                           "This trigger editor class is not recognized.", weobj.SEVERITY_WARNING)
             continue
+        parsed_sections[we_type] = weobj.parse_blocks(we_type, blocks[we_type], trusted)
+    return build_data(parsed_sections, blocks, report, trusted)
+
+
+def load_default_triggers(blocks, report=None):
+    """
+    Reads the [DefaultTriggerCategories] and [DefaultTriggers] sections of a BlockParser into an
+    editorobjects.DefaultTriggerList. These sections are not loaded by load_data, because they are not made of
+    independent declarations. The functions they use must have been loaded already.
+    """
+    return weobj.DefaultTriggerList.from_blocks(blocks, report)
+
+
+def load_cached_file(path, encoding=None, report=None):
+    """
+    Same as load_data, but reads a file from its path and uses its parse cache (see editorobjects.load_parsed_sections).
+    Files that are known to be valid (see editorobjects.is_trusted_file) are loaded in trusted mode.
+    """
+    digest = weobj.file_digest(path)
+    trusted = weobj.is_trusted_file(path, digest)
+    return build_data(weobj.load_parsed_sections(path, encoding, trusted, digest), report=report, trusted=trusted)
+
+
+def build_data(parsed_sections, blocks=None, report=None, trusted=False):
+    """
+    Creates the TriggerEditorObjects from the results of editorobjects.parse_blocks for each section. Blocks with
+    syntax errors are printed (if the BlockParser they were parsed from is given) and skipped.
+
+    If a DiagnosticReport is given, blocks with syntax errors are recorded in it instead of being printed. In that case,
+    every block is checked before building its object (see TriggerEditorObjectParser.diagnose), so no exception is
+    raised. Every problem of a block is recorded. Blocks with errors are skipped, including errors that would only be
+    raised later, such as block parameters that cannot be converted. Blocks with only warnings, such as undefined
+    argument types, are built.
+
+    If trusted is True, the blocks must come from a file that is known to be valid and must have been parsed in trusted
+    mode (see editorobjects.parse_blocks). The objects of each section are built from tuples, without being checked,
+    and registered in bulk (see TriggerEditorObjectParser.build_trusted_objects). Any syntax error is raised.
+
+    :return: An OrderedDict which maps section names to OrderedDicts of objects by name.
+    """
+    data = OrderedDict()
+    for we_type, parsed_blocks in parsed_sections.iteritems():
+        parser = weobj.TriggerEditorObjectParser(we_type)
         data[we_type] = OrderedDict()
-        for block in blocks[we_type]:
-            # temp = parser.parse_block_to_object(block)
+        if trusted:
+            for obj in parser.build_trusted_objects(parsed_blocks):
+                data[we_type][obj.name] = obj
+            continue
+        line_numbers = blocks.line_numbers(we_type) if blocks is not None else None
+        for index, parsed in enumerate(parsed_blocks):
+            if report is not None:
+                problems = parser.diagnose(parsed)
+                for message, severity in problems:
+                    _report_block(report, we_type, parsed, blocks, line_numbers, index, message, severity)
+                if any(severity == weobj.SEVERITY_ERROR for _, severity in problems):
+                    continue
             try:
-                temp = parser.parse_block_to_object(block)
-            except TriggerSyntaxException as e:
-                print block
-                print e.message
+                temp = parser.build_object(parsed)
+            except weobj.INVALID_BLOCK_ERRORS as e:
+                if report is not None:
+                    _report_block(report, we_type, parsed, blocks, line_numbers, index, str(e))
+                    continue
+                if blocks is not None:
+                    print blocks[we_type][index]
+                print e
                 continue
             data[we_type][temp.name] = temp
+    return data
+
+
+def _report_block(report, we_type, parsed, blocks, line_numbers, index, message, severity=weobj.SEVERITY_ERROR):
+    if not isinstance(parsed, Exception):
+        symbol = parsed[0]['name']
+    elif blocks is not None:
+        symbol = blocks[we_type][index][0].partition('=')[0]
+    else:
+        symbol = None
+    report.add(we_type, line_numbers[index] if line_numbers else None, symbol, message, severity)
+
+
+if __name__ == "__main__":
+    blocks = read_path('a.txt')
+
+    data = load_data(blocks)
 
     a = data.keys()
     easygui.choicebox('Hello', 'Choices', data[a[1]].keys())
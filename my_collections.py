@@ -82,6 +82,13 @@ class ValidatedDict(collections.MutableMapping):
     # chosen because it's more convenient to use in code and makes ValidatedDict behave as if it were an object with
     # defined members.
     # endregion
+    @classmethod
+    def from_valid_map(cls, valid_keys, map_):
+        """Creates a ValidatedDict from a dict whose keys are already known to be valid, without checking them."""
+        self = cls(valid_keys)
+        self._map = map_
+        return self
+
     def __getitem__(self, key):
         if key not in self._valid_keys:
             raise TriggerSyntaxException("'"+str(key)+"'is not a valid argument.")
@@ -123,35 +130,117 @@ class ValidatedDict(collections.MutableMapping):
 
 
 class BlockParser(collections.Mapping):
+    """
+    Maps section names to lists of blocks, where each block is a list of lines.
+
+    If a source is given, the BlockParser is lazy: it only records the byte range of each section, and a section's
+    blocks are parsed the first time that section is accessed. The source must provide the sections attribute and the
+    section_range, section_line_number and iter_numbered_blocks methods (see editorfiles.MappedTriggerData). Once every
+    section has been parsed, the source is closed. A lazy BlockParser should be closed when it is no longer used, either
+    by calling close() or by using it as a context manager, so its source is released even if some sections are never
+    accessed.
+
+    The line numbers of section headers and of the first line of each block are recorded when they are known.
+    """
 
     def __getitem__(self, k):
         # type: (str) -> list[list]
-        return self._map[k]
+        blocks = self._map[k]
+        if blocks is None:
+            if self._source is None:
+                raise ValueError('Section ' + k + ' was not parsed before the BlockParser was closed.')
+            # The section is only stored once it has been parsed completely, so a syntax error does not leave it
+            # partially parsed.
+            blocks = []
+            line_numbers = []
+            for line_number, block in self._source.iter_numbered_blocks(k):
+                line_numbers.append(line_number)
+                blocks.append(block)
+            self._map[k] = blocks
+            self._line_numbers[k] = line_numbers
+            self._unparsed -= 1
+            if not self._unparsed:
+                self.close()
+        return blocks
 
     def __iter__(self):
         for key in self._map:
             yield key
 
     def __len__(self):
-        len(self._map)
+        return len(self._map)
 
-    def __init__(self):
+    def __init__(self, source=None):
         self._map = collections.OrderedDict()
+        self._line_numbers = {}
+        self._section_line_numbers = {}
         self._category = ''
         self._index = 0
 
+        self._source = source
+        self._ranges = {}
+        self._unparsed = 0
+        if source is not None:
+            for name in source.sections:
+                self._map[name] = None
+                self._ranges[name] = source.section_range(name)
+                self._section_line_numbers[name] = source.section_line_number(name)
+            self._unparsed = len(self._map)
+            if not self._unparsed:
+                self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the source of a lazy BlockParser. Sections that have been parsed can still be accessed. Accessing a
+        section that has not been parsed raises a ValueError.
+        """
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def section_range(self, name):
+        # type: (str) -> tuple[int, int]
+        """Returns the byte range of a section in the source file. Only available for lazy BlockParsers."""
+        return self._ranges[name]
+
+    def is_parsed(self, name):
+        # type: (str) -> bool
+        return self._map[name] is not None
+
+    def line_numbers(self, name):
+        # type: (str) -> list
+        """Returns the line numbers of the first line of each block in a section. Unknown line numbers are None."""
+        blocks = self[name]
+        line_numbers = self._line_numbers[name]
+        if len(line_numbers) < len(blocks):
+            line_numbers.extend([None] * (len(blocks) - len(line_numbers)))
+        return line_numbers
+
+    def section_line_number(self, name):
+        """Returns the line number of a section's header, or None if it is unknown."""
+        return self._section_line_numbers.get(name)
+
     def set_category(self, name):
         raise NotImplementedError
 
-    def new_category(self, name):
+    def new_category(self, name, line_number=None):
         if name in self._map:
             raise TriggerSyntaxException('Category ' + name + ' already exists!')
 
         self._map[name] = []
+        self._line_numbers[name] = []
+        self._section_line_numbers[name] = line_number
         self._category = name
 
-    def new_block(self):
+    def new_block(self, line_number=None):
         self._map[self._category].append([])
+        self._line_numbers[self._category].append(line_number)
 
     def add_line(self, line):
         try:
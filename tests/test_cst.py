@@ -0,0 +1,56 @@
+"""
+Tests for editorfiles.cst. Run from the root of the repository with: python -m unittest discover tests
+"""
+import unittest
+
+import main
+import editorobjects as weobj
+from editorfiles import TriggerDataDocument
+
+
+DOCUMENT = u"""[TriggerCategories]
+// Categories
+TC_A = WESTRING_A,none   // Comment after a declaration.
+TC_B=WESTRING_B,none,1
+
+[TriggerActions]
+DoThing=0,real
+// Comment between block members.
+_DoThing_Limits=0,_
+_DoThing_Category=TC_A
+_DoThing_Defaults=1
+"""
+
+
+class UpdateObjectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.document = TriggerDataDocument(DOCUMENT)
+        self.workspace = weobj.Workspace()
+        with self.workspace:
+            self.data = main.load_data(main.read_file(DOCUMENT.splitlines(True)))
+
+    def write_back(self):
+        for section, objects in self.data.iteritems():
+            for obj in objects.itervalues():
+                self.document.update_object(section, obj)
+
+    def test_unchanged_objects_are_not_rewritten(self):
+        self.write_back()
+        self.assertFalse(self.document.modified)
+        self.assertEqual(self.document.to_text(), DOCUMENT)
+
+    def test_only_changed_blocks_are_rewritten(self):
+        with self.workspace:
+            self.data[u'TriggerActions'][u'DoThing'].block_params['Defaults'] = u'2'
+        self.write_back()
+
+        text = self.document.to_text()
+        self.assertTrue(self.document.modified)
+        self.assertEqual(text[:text.index(u'DoThing=')], DOCUMENT[:DOCUMENT.index(u'DoThing=')])
+        self.assertIn(u'_DoThing_Defaults=2', text)
+        self.assertNotIn(u'Comment between block members', text)
+
+
+if __name__ == '__main__':
+    unittest.main()